@@ -40,20 +40,75 @@ AI: ALWAYS analyze user intent, identify triggers, and use conditional tools for
 
 from fastmcp import FastMCP
 import serial
-import asyncio
 import threading
 from datetime import datetime
 from typing import Optional
 import time
 import re
+import sys
+import os
+import array
+import atexit
+import struct
+import queue
+import bisect
+from collections import defaultdict, deque
+from itertools import count
+from operator import itemgetter
 
 # Configuration
 COM_PORT = "COM6"
-BAUD_RATE = 9600
+BAUD_RATE = 115200
+SERIAL_RX_BUFFER = 64  # Arduino hardware serial receive buffer (bytes)
+SERIAL_TIMEOUT = 0.05  # Per-read timeout for replies and the status monitor (seconds)
+REPLY_TIMEOUT = 0.1    # Deadline for a command's reply, status lines included (seconds)
+READY_TIMEOUT = 2.5    # Upper bound on the Arduino boot after reset (seconds)
+CLOCK_RESYNC_INTERVAL = 600  # Re-push PC time to the Arduino clock every 10 minutes
+ULTRA_CACHE_TTL = 0.003     # Back-to-back distance reads inside this window reuse the last one (s)
+TX_QUEUE_SIZE = 256         # Outbound commands the writer thread can fall behind by
+PROX_CRITICAL_CM = 10       # proximity_alert thresholds (run on the Arduino)
+PROX_WARN_CM = 30
+PROX_HYSTERESIS_CM = 2      # Matches proxHysteresisCm in master_control.ino
+MAX_PENDING_ACTIONS = 32     # Per trigger type - keeps trigger scans on status lines short
+
+# Linux serial ioctls for low-latency mode
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 0x2000
+
+# Binary framing: 0xAA <op> <len> <payload> <crc8> (see master_control.ino).
+# Set to False to talk plain text lines, e.g. when sniffing the port by eye.
+BINARY_PROTOCOL = True
+FRAME_START = 0xAA
+
+# Arduino -> host opcodes
+OP_ACK = 0x80
+OP_TIMER_REMAINING = 0x81
+OP_COUNTDOWN_FINISHED = 0x82
+OP_CLOCK = 0x83
+OP_DISTANCE = 0x84
+OP_ULTRA = 0x85
+OP_ALERT = 0x86
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_I16 = struct.Struct("<h")
+_HMS = struct.Struct("<BBB")
+_ALERT = struct.Struct("<BH")  # PROX state index, distance cm*100
+_PROX_STATES = ("OFF", "CLEAR", "WARN", "CRITICAL")
+NO_ECHO = 0xFFFF  # Distance payload when the sensor got no echo
+
+# Status messages pushed by the Arduino: <prefix><payload>\r\n
+_STATUS_RE = re.compile(rb"TIMER:REMAINING:|COUNTDOWN:FINISHED|CLOCK:LCD:|DISTANCE:|ALERT:")
+
+# Tool argument formats
+_TIME_RE = re.compile(r'^\d{2}:\d{2}:\d{2}$')  # HH:MM:SS
+_MMSS_RE = re.compile(r'^(\d+):(\d+)$')         # MM:SS
+
+_DIGIT_PAIRS = [f"{i:02d}" for i in range(100)]  # 0-99 -> "00".."99" for clock / countdown digits
 
 # Global Arduino connection
 arduino_connection = None
-connection_lock = asyncio.Lock()
 
 # Global state tracking (updated by background monitor)
 arduino_state = {
@@ -61,48 +116,558 @@ arduino_state = {
     "timer_active": False,
     "clock_time": None,
     "distance": 0.0,
-    "last_update": time.time()
+    "proximity": None,  # PROX:AUTO state (CLEAR/WARN/CRITICAL), None when not armed
+    "last_update": time.monotonic(),
+    "_status_cache": None  # (time.monotonic(), rendered get_current_status body)
 }
+STATUS_CACHE_TTL = 0.5  # Seconds a rendered status report is reused while nothing changed
+
+# Most recent ultrasonic reading (cm) and when it was taken (time.monotonic())
+_ultra_cache = {"d": None, "t": 0.0}
+_ultra_seq = count(1)  # ULTRA:READ:<seq> sequence numbers (mod 256)
 
 # Background monitoring thread
 monitor_thread = None
+status_thread = None
 monitor_running = False
 
-# Conditional actions queue
-pending_actions = []
+# Clock drift-correction thread (started by the clock tools)
+clock_sync_thread = None
+
+# Conditional actions, indexed by trigger type so each status message only
+# touches the actions it fires:
+#   timer_zero         - FIFO, drained on COUNTDOWN:FINISHED
+#   time_equals        - target_time -> actions, one lookup per clock tick
+#   distance_less_than - sorted by target_distance; a reading fires the suffix above it
+pending_actions = {
+    "timer_zero": deque(),
+    "time_equals": defaultdict(list),
+    "distance_less_than": [],
+}
+_target_distance = itemgetter("target_distance")
+pending_lock = threading.Lock()  # Shared by tool handlers and the monitor thread
+
+# Held for each write + reply wait so exchanges can't interleave on the wire
+_serial_lock = threading.Lock()
+_connect_lock = threading.Lock()  # Reader and writer both open the port on demand
+
+# The monitor thread is the only reader of the port; it sorts every inbound
+# message onto one of these. Reply queues are bounded and drop their oldest
+# entry - replies nobody waited for (the rest of a batch, ULTRA:START samples).
+_q_status = queue.Queue()         # TIMER/COUNTDOWN/CLOCK/DISTANCE/ALERT -> status worker
+_q_ultra = queue.Queue(maxsize=8)  # ULTRA: readings
+_q_ack = queue.Queue(maxsize=64)   # Everything else: OK:/ACK frames, ERROR:, STATUS lines
+_proximity_event = threading.Event()  # Set on each ALERT: (PROX:AUTO state known)
+
+# Last value the Arduino acknowledged for each display slot, so identical
+# redraws are skipped. Any other command for the same display invalidates its
+# slots; TM1637:NUM isn't recorded while the 7-segment stopwatch runs (NUM
+# doesn't stop it, so it draws straight over the number).
+_DEDUPE_TARGETS = ("LCD:LINE1", "LCD:LINE2", "TM1637:NUM")
+_last_sent: dict[str, str] = {}
+_tm1637_stopwatch = False
+
+# Commands per display that are queued but not yet acknowledged (or failed).
+# _last_sent can't say what the display will show once they are written, so
+# nothing for that display is skipped meanwhile.
+_in_flight = {"LCD": 0, "TM1637": 0}
+_in_flight_lock = threading.Lock()
+
+# Outbound writes, performed in order by the writer thread:
+# (payload, reply prefix to wait for, reply slot or None for fire-and-forget,
+#  commands the payload carries - each waited for by its own ack, and noted
+#  in _last_sent once acknowledged)
+_tx_queue = queue.Queue(maxsize=TX_QUEUE_SIZE)
+writer_thread = None
 
 # Initialize FastMCP server
 mcp = FastMCP("Arduino Master Control", dependencies=["pyserial"])
 
 def get_arduino():
-    """Get or create Arduino serial connection"""
+    """Get the cached Arduino serial connection, opening it on first use"""
     global arduino_connection
-    if arduino_connection is None or not arduino_connection.is_open:
-        try:
-            arduino_connection = serial.Serial(COM_PORT, BAUD_RATE, timeout=0.5)
-            time.sleep(2)  # Wait for Arduino reset
-        except serial.SerialException as e:
-            raise Exception(f"Failed to connect to Arduino on {COM_PORT}: {e}")
+    if arduino_connection is not None:
+        return arduino_connection
+    with _connect_lock:
+        if arduino_connection is None:
+            arduino_connection = _open_arduino()
     return arduino_connection
 
-def send_command(command: str) -> str:
-    """Send command to Arduino and get response"""
-    arduino = get_arduino()
+def _open_arduino():
+    try:
+        arduino = serial.Serial(COM_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+        _configure_port(arduino)
+        _wait_for_ready(arduino)
+        if BINARY_PROTOCOL:
+            arduino.write(b"PROTO:BINARY\n")  # Status as frames from here on
+        _forget_displays()  # Opening the port resets the Arduino - displays are blank
+        arduino_state["proximity"] = None
+        _state_changed()
+    except serial.SerialException as e:
+        raise Exception(f"Failed to connect to Arduino on {COM_PORT}: {e}")
+    return arduino
+
+def _wait_for_ready(arduino):
+    """Wait for the sketch's READY banner after the open-triggered auto-reset"""
+    arduino.timeout = READY_TIMEOUT
+    try:
+        arduino.read_until(b"READY\r\n")
+    finally:
+        arduino.timeout = SERIAL_TIMEOUT
+
+def reset_arduino(failed=None):
+    """Close and forget the cached connection so the next use reopens the port
+
+    With failed, only if that port is still the cached one - the reader and
+    the writer can both hit the same error, and the first reset may already
+    have reopened the port.
+    """
+    global arduino_connection
+    with _connect_lock:
+        arduino = arduino_connection
+        if arduino is None or (failed is not None and arduino is not failed):
+            return
+        arduino_connection = None
+        try:
+            arduino.close()
+        except Exception:
+            pass
+
+atexit.register(reset_arduino)
+
+def _configure_port(arduino):
+    """Tune OS-side buffering so short status lines are delivered promptly"""
+    if sys.platform == "win32":
+        arduino.set_buffer_size(rx_size=65536, tx_size=4096)
+    _enable_low_latency(arduino)
+    _set_ftdi_latency_timer(arduino)
+
+def _set_ftdi_latency_timer(arduino):
+    """FTDI adapters hold reads for 16 ms by default - drop that to 1 ms via sysfs"""
+    if not sys.platform.startswith("linux"):
+        return
+    tty = os.path.basename(os.path.realpath(arduino.port))
+    try:
+        with open(f"/sys/bus/usb-serial/devices/{tty}/latency_timer", "w") as f:
+            f.write("1")
+    except OSError:
+        pass  # Not an FTDI adapter, or no permission (see README for a udev rule)
+
+def _enable_low_latency(arduino):
+    """Ask the serial driver to hand over bytes immediately (ASYNC_LOW_LATENCY)"""
+    try:
+        arduino.set_low_latency_mode(True)  # pyserial 3.5+, Linux
+    except AttributeError:
+        _set_async_low_latency(arduino)  # Older pyserial (or not a POSIX port)
+    except (NotImplementedError, ValueError):
+        pass  # Platform / driver doesn't support it
+
+def _set_async_low_latency(arduino):
+    """Direct TIOCSSERIAL fallback for pyserial without set_low_latency_mode()"""
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        import fcntl
+        buf = array.array('i', [0] * 32)
+        fcntl.ioctl(arduino.fd, TIOCGSERIAL, buf)
+        buf[4] |= ASYNC_LOW_LATENCY  # serial_struct.flags
+        fcntl.ioctl(arduino.fd, TIOCSSERIAL, buf)
+    except (OSError, AttributeError):
+        pass  # Not a real UART / driver doesn't support it
+
+def _make_crc8_table(poly=0x07):
+    table = bytearray(256)
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[byte] = crc
+    return bytes(table)
+
+_CRC8_TABLE = _make_crc8_table()
+
+def crc8(data: bytes) -> int:
+    """CRC-8 (polynomial 0x07, init 0) as computed by the sketch"""
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+def encode_frame(op: int, payload: bytes = b"") -> bytes:
+    """Build a binary frame: 0xAA <op> <len> <payload> <crc8>"""
+    body = bytes((op, len(payload))) + payload
+    return bytes((FRAME_START,)) + body + bytes((crc8(body),))
+
+def _pack_u8(value: str) -> bytes:
+    return _U8.pack(int(value))
+
+def _pack_seq(value: str) -> bytes:
+    return _U8.pack(int(value)) if value else b""  # ULTRA:READ takes an optional sequence number
+
+def _pack_u16(value: str) -> bytes:
+    return _U16.pack(int(value))
+
+def _pack_text(value: str) -> bytes:
+    return value[:16].encode('ascii')
+
+def _pack_number(value: str) -> Optional[bytes]:
+    if len(value) == 4:
+        return None  # 4-character values are drawn with the colon (see _pack_colon_digits)
+    return _I16.pack(int(value))
+
+def _pack_colon_digits(value: str) -> Optional[bytes]:
+    # "0130" -> 0x01 0x30: four BCD digits, drawn as 01:30
+    if len(value) != 4 or not (value.isascii() and value.isdigit()):
+        return None
+    return bytes.fromhex(value)
+
+# "DEVICE:ACTION" -> [(opcode, value packer), ...]; the first packer that accepts
+# the value wins, anything left over is sent as text
+_BINARY_COMMANDS = {
+    "LED:ON": [(0x01, None)],
+    "LED:OFF": [(0x02, None)],
+    "LED:BLINK": [(0x03, _pack_u16)],
+    "LED:TOGGLE": [(0x04, None)],
+    "BUZZER:ON": [(0x10, None)],
+    "BUZZER:OFF": [(0x11, None)],
+    "BUZZER:BEEP": [(0x12, _pack_u16)],
+    "LCD:LINE1": [(0x20, _pack_text)],
+    "LCD:LINE2": [(0x21, _pack_text)],
+    "LCD:CLEAR": [(0x22, None)],
+    "TM1637:NUM": [(0x34, _pack_colon_digits), (0x30, _pack_number)],
+    "TM1637:CLEAR": [(0x31, None)],
+    "TM1637:BRIGHTNESS": [(0x32, _pack_u8)],
+    "TM1637:COUNTDOWN": [(0x33, _pack_u16)],
+    "ULTRA:START": [(0x40, None)],
+    "ULTRA:STOP": [(0x41, None)],
+    "ULTRA:READ": [(0x42, _pack_seq)],
+}
+
+def encode_command(command: str) -> bytes:
+    """Encode one command for the wire: a binary frame if it has an opcode, else a text line"""
+    if BINARY_PROTOCOL:
+        device, _, rest = command.partition(":")
+        action, _, value = rest.partition(":")
+        for op, pack in _BINARY_COMMANDS.get(f"{device}:{action}", ()):
+            try:
+                payload = pack(value) if pack else b""
+            except (ValueError, UnicodeEncodeError, struct.error):
+                payload = None  # Out of range / not encodable - the text form still works
+            if payload is not None:
+                return encode_frame(op, payload)
+    return f"{command}\n".encode()
+
+# Fixed commands, encoded once
+_CMD_LED_OFF = encode_command("LED:OFF")
+_CMD_BUZZER_OFF = encode_command("BUZZER:OFF")
+_CMD_LCD_CLEAR = encode_command("LCD:CLEAR")
+_CMD_TM1637_CLEAR = encode_command("TM1637:CLEAR")
+_CMD_ULTRA_STOP = encode_command("ULTRA:STOP")
+_CMD_ULTRA_READ = [encode_command(f"ULTRA:READ:{seq}") for seq in range(256)]  # By sequence number
+_CMD_STATUS = encode_command("STATUS")
+_CMD_ALL_OFF = _CMD_LED_OFF + _CMD_BUZZER_OFF + _CMD_LCD_CLEAR + _CMD_TM1637_CLEAR + _CMD_ULTRA_STOP
+_ALL_OFF = ("LED:OFF", "BUZZER:OFF", "LCD:CLEAR", "TM1637:CLEAR", "ULTRA:STOP")  # What _CMD_ALL_OFF carries
+
+def decode_distance(payload: bytes) -> float:
+    """u16 cm*100 -> cm (-1 when the sensor got no echo, as in the text protocol)"""
+    raw = _U16.unpack_from(payload)[0]
+    return -1.0 if raw == NO_ECHO else raw / 100
+
+_DISTANCE_CHARS = frozenset("0123456789.-")
+
+def parse_distance(reply: str) -> Optional[float]:
+    """cm from an "ULTRA:[<seq>:]<cm>" reply (None if the reply isn't one)"""
+    prefix, _, value = reply.rpartition(":")
+    if prefix.partition(":")[0] != "ULTRA" or not value or not _DISTANCE_CHARS.issuperset(value):
+        return None
     try:
-        arduino.write(f"{command}\n".encode())
-        time.sleep(0.05)  # Small delay for Arduino to process
+        return float(value)
+    except ValueError:  # Right characters, wrong shape ("1.2.3")
+        return None
+
+def read_message(arduino) -> bytes:
+    """Read one message: a text line, or a whole binary frame (first byte 0xAA)"""
+    if not BINARY_PROTOCOL:
+        return arduino.readline()
+    first = arduino.read(1)
+    if first != b"\xaa":
+        return first + arduino.readline() if first else b""
+    header = arduino.read(2)
+    if len(header) < 2:
+        return b""
+    body = header + arduino.read(header[1] + 1)
+    if len(body) != header[1] + 3 or crc8(body[:-1]) != body[-1]:
+        return b""  # Truncated or corrupt frame - drop it
+    return first + body
+
+def describe_frame(frame: bytes) -> str:
+    """Render a reply frame the way the text protocol would have said it"""
+    op, payload = frame[1], frame[3:-1]
+    if op == OP_ULTRA:
+        if len(payload) == 3:
+            return f"ULTRA:{payload[0]}:{decode_distance(payload[1:]):.2f}"
+        return f"ULTRA:{decode_distance(payload):.2f}"
+    if op == OP_ALERT:
+        state = _PROX_STATES[payload[0]]
+        if state == "OFF":
+            return "ALERT:OFF"
+        return f"ALERT:{state}:{decode_distance(payload[1:]):.2f}"
+    return "OK"
+
+def _write_and_read(payload: bytes, expect: Optional[str] = None, shown=()) -> str:
+    """Write raw bytes to Arduino and return the reply (the first starting with expect, if given)
+
+    shown lists the commands the payload carries; their display state is
+    recorded once the Arduino acknowledges them, and forgotten otherwise.
+    """
+    replies = _q_ultra if expect is not None and expect.startswith("ULTRA:") else _q_ack
+    with _serial_lock:
+        _drain(replies)
+        arduino = None
+        try:
+            arduino = get_arduino()
+            arduino.write(payload)
+        except serial.SerialException as e:
+            reset_arduino(arduino)  # Port went away - reconnect on next command
+            _forget_displays()
+            _settle(shown, acked=False)
+            return f"ERROR: {e}"
+        except Exception as e:
+            _forget_displays()  # Don't know what the displays show any more
+            _settle(shown, acked=False)
+            return f"ERROR: {e}"
         
-        # Read response if available
-        if arduino.in_waiting > 0:
-            response = arduino.readline().decode('utf-8').strip()
-            return response
+        # The monitor thread hands us the reply; skip any that aren't ours
+        # (continuous ULTRA:START samples, a reading for an earlier sequence number)
+        deadline = time.monotonic() + REPLY_TIMEOUT
+        if expect is None and shown:
+            return _await_acks(replies, shown, deadline)
+        while True:
+            try:
+                reply = _render(replies.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                _settle(shown, acked=False)  # May not have arrived
+                return "OK" if expect is None else f"ERROR: No {expect} reply"
+            if expect is None or reply.startswith(expect):
+                _settle(shown, acked=not reply.startswith("ERROR"))
+                return reply or "OK"
+
+# Commands the sketch doesn't always ack (LED:TOGGLE while blinking) - not waited for
+_UNACKED = frozenset({"LED:TOGGLE"})
+
+def _ack_key(command: str):
+    """What the command's ack looks like: the echoed opcode of an ACK frame, or the OK: text prefix"""
+    target = _display_slot(command)[0]
+    if target in _UNACKED:
+        return None
+    encoded = encode_command(command)
+    if encoded[0] == FRAME_START:
+        return encoded[1]
+    return f"OK:{target}".encode()
+
+def _is_ack(message: bytes, key) -> bool:
+    if isinstance(key, int):
+        return message[0] == FRAME_START and message[1] == OP_ACK and message[3:4] == bytes([key])
+    return message.startswith(key)
+
+def _await_acks(replies: queue.Queue, shown, deadline: float) -> str:
+    """Match each command's own ack, in order; commands passed over or timed out count as lost
+
+    Acks nobody matches (late ones for an earlier write) are skipped. An
+    ERROR: line is the reply to the oldest command still waiting.
+    """
+    waiting = [(i, key) for i, command in enumerate(shown) if (key := _ack_key(command)) is not None]
+    lost, response = set(), None
+    while waiting:
+        try:
+            message = replies.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            break
+        if message.startswith(b"ERROR"):
+            lost.add(waiting.pop(0)[0])
+            response = response or _render(message)
+            continue
+        for n, (i, key) in enumerate(waiting):
+            if _is_ack(message, key):
+                lost.update(passed for passed, _ in waiting[:n])
+                del waiting[:n + 1]
+                response = response or _render(message)
+                break
+    lost.update(i for i, _ in waiting)
+    for i, command in enumerate(shown):
+        _settle((command,), acked=i not in lost)
+    return response or "OK"
+
+def _render(message: bytes) -> str:
+    """Reply as text (frames rendered the way the text protocol would say them)"""
+    if message[0] == FRAME_START:
+        return describe_frame(message)
+    return message.decode('utf-8', errors='replace').strip()
+
+def _drain(replies: queue.Queue):
+    """Discard replies nobody waited for"""
+    while True:
+        try:
+            replies.get_nowait()
+        except queue.Empty:
+            return
+
+def _offer(replies: queue.Queue, message: bytes):
+    """put_nowait, dropping the oldest entry when nobody has been reading"""
+    while True:
+        try:
+            replies.put_nowait(message)
+            return
+        except queue.Full:
+            try:
+                replies.get_nowait()
+            except queue.Empty:
+                pass
+
+def _display_slot(command: str) -> tuple[str, str]:
+    """Split "DEVICE:ACTION:VALUE" into ("DEVICE:ACTION", "VALUE") (DISPLAY = TM1637)"""
+    device, _, rest = command.partition(":")
+    action, _, value = rest.partition(":")
+    if device == "DISPLAY":
+        device = "TM1637"
+    return f"{device}:{action}", value
+
+def _is_redundant(command: str) -> bool:
+    """True if the command would redraw exactly what its display already shows"""
+    target, value = _display_slot(command)
+    return (target in _DEDUPE_TARGETS and not _in_flight[target.partition(":")[0]]
+            and _last_sent.get(target) == value)
+
+def _track(command: str):
+    """Count a display command as in flight from when it is queued until _settle()"""
+    device = _display_slot(command)[0].partition(":")[0]
+    if device in _in_flight:
+        with _in_flight_lock:
+            _in_flight[device] += 1
+
+def _settle(shown, acked: bool):
+    """Fold the outcome of written commands into the display cache (writer thread)"""
+    global _tm1637_stopwatch
+    for command in shown:
+        target, value = _display_slot(command)
+        device = target.partition(":")[0]
+        if device not in _in_flight:
+            continue
+        if target in _DEDUPE_TARGETS and acked:
+            if not (target == "TM1637:NUM" and _tm1637_stopwatch):
+                _last_sent[target] = value
+        else:
+            # Lost / refused, or CLEAR / CLOCK / STOPWATCH / COUNTDOWN / ...
+            # that changes what the display shows
+            _forget_display(command)
+            if target == "TM1637:STOPWATCH":
+                _tm1637_stopwatch = value == "START" or not acked  # Unsure - assume it runs
+            elif target == "TM1637:CLOCK" and acked:
+                _tm1637_stopwatch = False
+        with _in_flight_lock:
+            _in_flight[device] -= 1
+
+def _forget_display(command: str):
+    """Drop the dedupe slots of the display a command is for"""
+    device = _display_slot(command)[0].partition(":")[0] + ":"
+    for slot in [slot for slot in list(_last_sent) if slot.startswith(device)]:
+        del _last_sent[slot]
+
+def _forget_displays():
+    """Both displays are blank (Arduino reset) or unknown (failed write)"""
+    global _tm1637_stopwatch
+    _last_sent.clear()
+    _tm1637_stopwatch = False
+
+def _submit(payload: bytes, expect: Optional[str] = None, wait: bool = False, shown=()) -> str:
+    """Queue a payload for the writer thread; with wait, block until its reply is in
+
+    shown = the commands the payload carries, each already _track()ed.
+    """
+    reply = {"done": threading.Event(), "response": None} if wait else None
+    item = (payload, expect, reply, shown)
+    try:
+        _tx_queue.put_nowait(item)
+    except queue.Full:
+        _tx_queue.put(item)  # Writer is behind - wait for room
+    if reply is None:
         return "OK"
-    except Exception as e:
-        return f"ERROR: {e}"
+    reply["done"].wait()
+    return reply["response"]
+
+def send_command(command: str) -> str:
+    """Queue command for the writer thread
+
+    Display updates identical to the last acknowledged one are skipped.
+    """
+    if _is_redundant(command):
+        return "OK"
+    _track(command)
+    return _submit(encode_command(command), shown=(command,))
+
+def send_command_now(command: str, expect: Optional[str] = None) -> str:
+    """Send command and wait for its reply
+
+    With expect, wait for the reply starting with that prefix (e.g. "ULTRA:").
+    """
+    if _is_redundant(command):
+        return "OK"
+    _track(command)
+    return _submit(encode_command(command), expect, wait=True, shown=(command,))
+
+def send_bytes(payload: bytes, expect: Optional[str] = None, wait: bool = False, shown=()) -> str:
+    """Send pre-encoded command bytes (one of the _CMD_* constants) as they are
+
+    No display dedupe - shown names the display commands the bytes carry.
+    """
+    for command in shown:
+        _track(command)
+    return _submit(payload, expect, wait, shown)
+
+def send_commands(commands: list[str]) -> str:
+    """Send several commands with as few serial writes as possible"""
+    # Split into chunks that fit the Arduino's serial receive buffer
+    chunk, shown = b"", []
+    for command in commands:
+        if _is_redundant(command):
+            continue
+        encoded = encode_command(command)
+        if chunk and len(chunk) + len(encoded) > SERIAL_RX_BUFFER:
+            _submit(chunk, shown=shown)
+            chunk, shown = b"", []
+        chunk += encoded
+        shown.append(command)
+        _track(command)  # Before the next command's check - a CLEAR here unblocks a repeat LINE1
+    if chunk:
+        _submit(chunk, shown=shown)
+    return "OK"
+
+def start_writer():
+    """Start the thread that performs queued serial writes"""
+    global writer_thread
+    
+    if writer_thread is not None:
+        return
+    
+    writer_thread = threading.Thread(target=serial_writer, daemon=True)
+    writer_thread.start()
+
+def serial_writer():
+    """Background thread function: write queued payloads in order, one exchange at a time"""
+    while True:
+        payload, expect, reply, shown = _tx_queue.get()
+        try:
+            # Waiting for each ack paces us to the Arduino's 64-byte receive buffer
+            response = _write_and_read(payload, expect, shown)
+        except Exception as e:
+            response = f"ERROR: {e}"  # e.g. port not there - keep the writer alive
+        if reply is not None:
+            reply["response"] = response
+            reply["done"].set()
 
 def start_background_monitor():
-    """Start background thread to monitor Arduino status messages"""
-    global monitor_thread, monitor_running
+    """Start the port reader thread and the status worker behind it"""
+    global monitor_thread, status_thread, monitor_running
     
     if monitor_running:
         return
@@ -110,72 +675,244 @@ def start_background_monitor():
     monitor_running = True
     monitor_thread = threading.Thread(target=monitor_arduino_status, daemon=True)
     monitor_thread.start()
+    status_thread = threading.Thread(target=process_status_messages, daemon=True)
+    status_thread.start()
 
 def stop_background_monitor():
     """Stop background monitoring thread"""
     global monitor_running
     monitor_running = False
 
+# Handlers slice the payload at the fixed prefix length; int()/float()
+# take bytes directly and ignore the trailing \r\n.
+
+def _on_timer_remaining(line: bytes):
+    """TIMER:REMAINING:<seconds> - countdown tick"""
+    _timer_tick(int(line[16:]))
+
+def _on_countdown_finished(line: bytes):
+    """COUNTDOWN:FINISHED - fire timer_zero triggers"""
+    _countdown_finished()
+
+def _on_clock(line: bytes):
+    """CLOCK:LCD:HH:MM:SS - LCD clock tick, fire time_equals triggers"""
+    _clock_tick(line[10:18].decode('ascii', errors='replace'))
+
+def _on_distance(line: bytes):
+    """DISTANCE:<cm> - ultrasonic sample, fire distance triggers"""
+    _distance_sample(float(line[9:]))
+
+def _on_alert(line: bytes):
+    """ALERT:<state>[:<cm>] - proximity alarm changed state"""
+    state, _, distance = line[6:].partition(b":")
+    state = state.strip().decode('ascii')
+    _proximity_changed(state, float(distance) if distance else None)
+
+# Status line prefix -> handler (called with the raw line)
+_STATUS_HANDLERS = {
+    b"TIMER:REMAINING:": _on_timer_remaining,
+    b"COUNTDOWN:FINISHED": _on_countdown_finished,
+    b"CLOCK:LCD:": _on_clock,
+    b"DISTANCE:": _on_distance,
+    b"ALERT:": _on_alert,
+}
+
+# Status frame opcode -> handler (called with the frame payload)
+_FRAME_HANDLERS = {
+    OP_TIMER_REMAINING: lambda payload: _timer_tick(_U16.unpack(payload)[0]),
+    OP_COUNTDOWN_FINISHED: lambda payload: _countdown_finished(),
+    OP_CLOCK: lambda payload: _clock_tick(":".join([_DIGIT_PAIRS[v] for v in _HMS.unpack(payload)])),
+    OP_DISTANCE: lambda payload: _distance_sample(decode_distance(payload)),
+    OP_ALERT: lambda payload: _proximity_changed(
+        _PROX_STATES[payload[0]], decode_distance(payload[1:]) if payload[0] else None),
+}
+
+def _state_changed():
+    """Stamp an arduino_state update and drop the rendered status report"""
+    arduino_state["last_update"] = time.monotonic()
+    arduino_state["_status_cache"] = None
+
+def _timer_tick(remaining: int):
+    """Countdown tick (seconds remaining)"""
+    arduino_state["timer_remaining"] = remaining
+    arduino_state["timer_active"] = True
+    _state_changed()
+
+def _countdown_finished():
+    """Countdown reached zero - fire timer_zero triggers"""
+    arduino_state["timer_remaining"] = 0
+    arduino_state["timer_active"] = False
+    _state_changed()
+    
+    # Execute pending actions triggered by timer completion
+    for action in take_pending_actions("timer_zero"):
+        execute_action(action)
+
+def _clock_tick(time_str: str):
+    """Arduino clock tick (HH:MM:SS) - fire time_equals triggers"""
+    arduino_state["clock_time"] = time_str
+    _state_changed()
+    
+    # Check time-based triggers
+    for action in take_pending_actions("time_equals", time_str):
+        execute_action(action)
+
+def _distance_sample(distance: float):
+    """Ultrasonic sample (cm) - fire distance triggers"""
+    _cache_distance(distance)
+    arduino_state["distance"] = distance
+    _state_changed()
+    
+    # Check distance-based triggers
+    for action in take_pending_actions("distance_less_than", distance):
+        execute_action(action)
+
+def _proximity_changed(state: str, distance: Optional[float]):
+    """Proximity alarm transition (state OFF when disarmed)"""
+    arduino_state["proximity"] = None if state == "OFF" else state
+    if distance is not None:
+        arduino_state["distance"] = distance
+        _cache_distance(distance)
+    _state_changed()
+    _proximity_event.set()
+    
+    # The Arduino redrew the LCD itself
+    _forget_display("LCD")
+
 def monitor_arduino_status():
-    """Background thread function to continuously read Arduino status"""
-    global arduino_state, pending_actions
-    
+    """Background thread function: the single reader of the serial port"""
     while monitor_running:
+        arduino = None
         try:
             arduino = get_arduino()
-            if arduino and arduino.in_waiting > 0:
-                line = arduino.readline().decode('utf-8').strip()
-                
-                # Parse status messages from Arduino
-                if line.startswith("TIMER:REMAINING:"):
-                    remaining = int(line.split(':')[2])
-                    arduino_state["timer_remaining"] = remaining
-                    arduino_state["timer_active"] = True
-                    arduino_state["last_update"] = time.time()
-                    
-                elif line.startswith("COUNTDOWN:FINISHED"):
-                    arduino_state["timer_remaining"] = 0
-                    arduino_state["timer_active"] = False
-                    arduino_state["last_update"] = time.time()
-                    
-                    # Execute pending actions triggered by timer completion
-                    for action in pending_actions[:]:
-                        if action.get("trigger") == "timer_zero":
-                            execute_action(action)
-                            pending_actions.remove(action)
-                    
-                elif line.startswith("CLOCK:LCD:"):
-                    time_str = line.split(':', 2)[2]
-                    arduino_state["clock_time"] = time_str
-                    arduino_state["last_update"] = time.time()
-                    
-                    # Check time-based triggers
-                    for action in pending_actions[:]:
-                        if action.get("trigger") == "time_equals":
-                            if time_str == action.get("target_time"):
-                                execute_action(action)
-                                pending_actions.remove(action)
-                    
-                elif line.startswith("DISTANCE:"):
-                    distance = float(line.split(':')[1])
-                    arduino_state["distance"] = distance
-                    arduino_state["last_update"] = time.time()
-                    
-                    # Update LCD if distance monitoring is active
-                    for action in pending_actions[:]:
-                        if action.get("trigger") == "distance_update":
-                            send_command(f"LCD:LINE2:{distance:.2f} cm       ")
-                    
-                    # Check distance-based triggers
-                    for action in pending_actions[:]:
-                        if action.get("trigger") == "distance_less_than":
-                            if distance < action.get("target_distance"):
-                                execute_action(action)
-                                pending_actions.remove(action)
-            
-            time.sleep(0.05)  # Small delay to avoid CPU spinning
-        except Exception as e:
-            time.sleep(0.5)  # Longer delay on error
+            # Blocks until a full line/frame arrives (or the port timeout expires)
+            line = read_message(arduino)
+        except serial.SerialException:
+            reset_arduino(arduino)
+            time.sleep(0.5)  # Give the port time to come back
+            continue
+        except Exception:
+            time.sleep(0.5)  # Not connected (yet) - retry shortly
+            continue
+        if line:
+            _route_message(line)
+
+def _route_message(message: bytes):
+    """Hand an inbound message to whoever consumes it"""
+    if _is_status(message):
+        _q_status.put(message)
+    elif message[0] == FRAME_START:
+        _offer(_q_ultra if message[1] == OP_ULTRA else _q_ack, message)
+    elif message.startswith(b"ULTRA:"):
+        _offer(_q_ultra, message)
+    else:
+        _offer(_q_ack, message)
+
+def process_status_messages():
+    """Background thread function: update state and fire triggers from status messages
+
+    Kept off the reader thread: triggered actions send commands, and their
+    replies have to be read while they wait.
+    """
+    while monitor_running:
+        _dispatch_status(_q_status.get())
+
+def _is_status(message: bytes) -> bool:
+    """True for unsolicited status messages (as opposed to command replies)"""
+    if message[0] == FRAME_START:
+        return message[1] in _FRAME_HANDLERS
+    return _STATUS_RE.match(message) is not None
+
+def _dispatch_status(message: bytes):
+    """Route a status line or frame to its handler"""
+    try:
+        if message[0] == FRAME_START:
+            handler = _FRAME_HANDLERS.get(message[1])
+            if handler:
+                handler(message[3:-1])
+            return
+        
+        # Parse status messages from Arduino (prefixes are ASCII, match on raw bytes)
+        match = _STATUS_RE.match(message)
+        if match:
+            _STATUS_HANDLERS[match.group()](message)
+    except (ValueError, IndexError, struct.error):
+        pass  # Garbled line (e.g. baud glitch) - drop it without stalling triggers
+
+def _cache_distance(distance: float):
+    _ultra_cache["d"] = distance
+    _ultra_cache["t"] = time.monotonic()
+
+def _recent_distance() -> Optional[float]:
+    """Last ultrasonic reading if it is younger than ULTRA_CACHE_TTL, else None"""
+    if time.monotonic() - _ultra_cache["t"] < ULTRA_CACHE_TTL:
+        return _ultra_cache["d"]
+    return None
+
+def _read_distance() -> Optional[float]:
+    """Current distance in cm: a reading from the last few ms, else ULTRA:READ (None if no reply)"""
+    distance = _recent_distance()
+    if distance is None:
+        # The reply line carries the reading, tagged with our sequence number
+        seq = next(_ultra_seq) % 256
+        distance = parse_distance(send_bytes(_CMD_ULTRA_READ[seq], expect=f"ULTRA:{seq}:", wait=True))
+        if distance is not None:
+            _cache_distance(distance)
+    return distance
+
+def _proximity_state(distance: float, armed: Optional[str]) -> str:
+    """Alarm state for a reading, leaving the armed state only past the hysteresis (as the Arduino does)"""
+    if distance < PROX_CRITICAL_CM or (armed == "CRITICAL" and distance < PROX_CRITICAL_CM + PROX_HYSTERESIS_CM):
+        return "CRITICAL"
+    if distance < PROX_WARN_CM or (armed == "WARN" and distance < PROX_WARN_CM + PROX_HYSTERESIS_CM):
+        return "WARN"
+    return "CLEAR"
+
+def add_pending_action(action) -> bool:
+    """Queue a conditional action under its trigger type (False if that queue is full)"""
+    trigger = action["trigger"]
+    with pending_lock:
+        if _pending_count(trigger) >= MAX_PENDING_ACTIONS:
+            return False
+        if trigger == "time_equals":
+            pending_actions[trigger][action["target_time"]].append(action)
+        elif trigger == "distance_less_than":
+            bisect.insort(pending_actions[trigger], action, key=_target_distance)
+        else:
+            pending_actions[trigger].append(action)
+        arduino_state["_status_cache"] = None
+        return True
+
+def take_pending_actions(trigger, value=None):
+    """Remove and return the actions a trigger fires (value = clock time or distance)"""
+    with pending_lock:
+        actions = pending_actions[trigger]
+        if trigger == "time_equals":
+            due = actions.pop(value, [])
+        elif trigger == "distance_less_than":
+            # Every target above the reading fires
+            i = bisect.bisect_right(actions, value, key=_target_distance)
+            due = actions[i:]
+            del actions[i:]
+        else:
+            due = list(actions)  # timer_zero: all of them, in queue order
+            actions.clear()
+        if due:
+            arduino_state["_status_cache"] = None
+        return due
+
+def _pending_count(trigger) -> int:
+    if trigger == "time_equals":
+        return sum(len(queued) for queued in pending_actions[trigger].values())
+    return len(pending_actions[trigger])
+
+def _all_pending_actions() -> list:
+    """Flat snapshot of every pending action (call with pending_lock held)"""
+    return [
+        *pending_actions["timer_zero"],
+        *(a for queued in pending_actions["time_equals"].values() for a in queued),
+        *pending_actions["distance_less_than"],
+    ]
 
 def execute_action(action):
     """Execute a pending action"""
@@ -193,14 +930,38 @@ def execute_action(action):
         elif action_type == "led_blink":
             send_command(f"LED:BLINK:{params.get('interval', 1000)}")
         elif action_type == "display_message":
-            send_command(f"LCD:LINE1:{params.get('line1', '')}")
-            send_command(f"LCD:LINE2:{params.get('line2', '')}")
+            send_commands([
+                f"LCD:LINE1:{params.get('line1', '')}",
+                f"LCD:LINE2:{params.get('line2', '')}",
+            ])
         elif action_type == "custom_command":
             send_command(params.get("command", ""))
     except Exception as e:
         print(f"Error executing action: {e}")
 
-# Start monitoring when module loads
+def sync_clock_command(now: datetime) -> str:
+    """Build SYNC:EPOCH:<unix_seconds>:<utc_offset_minutes> for an aware datetime"""
+    offset_minutes = int(now.utcoffset().total_seconds()) // 60
+    return f"SYNC:EPOCH:{int(now.timestamp())}:{offset_minutes}"
+
+def start_clock_resync():
+    """Start background thread that re-syncs the Arduino clock to correct drift"""
+    global clock_sync_thread
+    
+    if clock_sync_thread is not None:
+        return
+    
+    clock_sync_thread = threading.Thread(target=resync_clock_periodically, daemon=True)
+    clock_sync_thread.start()
+
+def resync_clock_periodically():
+    """Background thread function: push SYNC:EPOCH every CLOCK_RESYNC_INTERVAL seconds"""
+    while True:
+        time.sleep(CLOCK_RESYNC_INTERVAL)
+        send_command(sync_clock_command(datetime.now().astimezone()))
+
+# Start the writer and monitoring threads when module loads
+start_writer()
 start_background_monitor()
 
 # ============================================================================
@@ -224,7 +985,7 @@ def led_off() -> str:
     This stops any blinking and turns the LED off completely.
     Use this to turn off the LED or stop it from blinking.
     """
-    response = send_command("LED:OFF")
+    response = send_bytes(_CMD_LED_OFF)
     return "LED turned OFF"
 
 @mcp.tool()
@@ -276,7 +1037,7 @@ def buzzer_off() -> str:
     This stops any continuous buzzing or beeping.
     Use this to silence the buzzer.
     """
-    response = send_command("BUZZER:OFF")
+    response = send_bytes(_CMD_BUZZER_OFF)
     return "Buzzer turned OFF (silent)"
 
 @mcp.tool()
@@ -294,7 +1055,7 @@ def buzzer_beep(duration_ms: int = 100) -> str:
     Args:
         duration_ms: How long the beep lasts in milliseconds (default: 100ms)
     """
-    response = send_command(f"BUZZER:BEEP:{duration_ms}")
+    response = send_command_now(f"BUZZER:BEEP:{duration_ms}")
     return f"Buzzer beeped once for {duration_ms}ms (automatically stopped)"
 
 # ============================================================================
@@ -394,9 +1155,10 @@ def lcd_display_message(line1: str, line2: str = "") -> str:
     """
     line1 = line1[:16]
     line2 = line2[:16]
-    send_command(f"LCD:LINE1:{line1}")
+    commands = [f"LCD:LINE1:{line1}"]
     if line2:
-        send_command(f"LCD:LINE2:{line2}")
+        commands.append(f"LCD:LINE2:{line2}")
+    send_commands(commands)
     return f"LCD now shows: Line 1='{line1}' | Line 2='{line2}'"
 
 @mcp.tool()
@@ -436,17 +1198,13 @@ def lcd_show_current_time() -> str:
     
     Returns: Confirmation that live clock started (updates automatically on Arduino)
     """
-    now = datetime.now()
-    hours = now.strftime("%H")
-    minutes = now.strftime("%M")
-    seconds = now.strftime("%S")
-    date = now.strftime("%m/%d/%Y")
-    day = now.strftime("%a")
+    now = datetime.now().astimezone()
+    shown = now.strftime("%H:%M:%S %m/%d/%Y %a")
     
-    # Send actual time to Arduino: LCD:CLOCK:HH:MM:SS:Date:Day
-    command = f"LCD:CLOCK:{hours}:{minutes}:{seconds}:{date}:{day}"
-    send_command(command)
-    return f"✅ LIVE CLOCK STARTED on LCD showing ACTUAL TIME: {hours}:{minutes}:{seconds} {date} {day}. The time will update automatically every second. To stop: use lcd_clear() or write new text."
+    # Sync the Arduino's wall clock once; it renders time and date itself from then on
+    send_commands([sync_clock_command(now), "LCD:CLOCK"])
+    start_clock_resync()
+    return f"✅ LIVE CLOCK STARTED on LCD showing ACTUAL TIME: {shown}. The time will update automatically every second. To stop: use lcd_clear() or write new text."
 
 @mcp.tool()
 def lcd_start_stopwatch() -> str:
@@ -583,14 +1341,13 @@ def display_current_time() -> str:
     
     Returns: Confirmation that live clock started (updates automatically on Arduino)
     """
-    now = datetime.now()
-    hours = now.strftime("%H")
-    minutes = now.strftime("%M")
+    now = datetime.now().astimezone()
+    shown = now.strftime("%H:%M")
     
-    # Send actual time to Arduino: TM1637:CLOCK:HH:MM
-    command = f"TM1637:CLOCK:{hours}:{minutes}"
-    send_command(command)
-    return f"✅ LIVE CLOCK STARTED on 7-segment display showing ACTUAL TIME: {hours}:{minutes}. The time will update automatically every second. To stop: use display_clear() or show a number."
+    # Sync the Arduino's wall clock once; it renders HH:MM itself from then on
+    send_commands([sync_clock_command(now), "TM1637:CLOCK"])
+    start_clock_resync()
+    return f"✅ LIVE CLOCK STARTED on 7-segment display showing ACTUAL TIME: {shown}. The time will update automatically every second. To stop: use display_clear() or show a number."
 
 @mcp.tool()
 def display_start_stopwatch() -> str:
@@ -742,7 +1499,7 @@ def ultrasonic_stop() -> str:
     This ends the continuous monitoring mode started by ultrasonic_start().
     The sensor will no longer read distances until you start it again.
     """
-    response = send_command("ULTRA:STOP")
+    response = send_bytes(_CMD_ULTRA_STOP)
     return "Ultrasonic sensor stopped (continuous monitoring ended)"
 
 @mcp.tool()
@@ -770,28 +1527,19 @@ def ultrasonic_read() -> str:
     
     For continuous monitoring, use ultrasonic_start() instead.
     """
-    arduino = get_arduino()
-    send_command("ULTRA:READ")
-    time.sleep(0.1)  # Wait for reading
+    distance = _read_distance()
+    if distance is None:
+        return "Error reading distance from ultrasonic sensor"
     
-    # Read response
-    if arduino.in_waiting > 0:
-        response = arduino.readline().decode('utf-8').strip()
-        if response.startswith("ULTRA:"):
-            try:
-                distance = float(response.split(':')[1])
-                if distance < 10:
-                    proximity = "VERY CLOSE"
-                elif distance < 30:
-                    proximity = "CLOSE"
-                elif distance < 100:
-                    proximity = "MEDIUM"
-                else:
-                    proximity = "FAR"
-                return f"Distance: {distance:.2f} cm ({proximity})"
-            except:
-                pass
-    return "Error reading distance from ultrasonic sensor"
+    if distance < 10:
+        proximity = "VERY CLOSE"
+    elif distance < 30:
+        proximity = "CLOSE"
+    elif distance < 100:
+        proximity = "MEDIUM"
+    else:
+        proximity = "FAR"
+    return f"Distance: {distance:.2f} cm ({proximity})"
 
 # ============================================================================
 # SYSTEM TOOLS
@@ -926,7 +1674,7 @@ def get_system_status() -> str:
     
     Use this to check what state all devices are in.
     """
-    response = send_command("STATUS")
+    response = send_bytes(_CMD_STATUS)
     return "System status requested - all device states reported"
 
 @mcp.tool()
@@ -969,11 +1717,7 @@ def all_off() -> str:
     
     This is like a "reset all" or "turn everything off" command.
     """
-    send_command("LED:OFF")
-    send_command("BUZZER:OFF")
-    send_command("LCD:CLEAR")
-    send_command("TM1637:CLEAR")
-    send_command("ULTRA:STOP")
+    send_bytes(_CMD_ALL_OFF, shown=_ALL_OFF)  # Both displays end up blank
     return "✓ ALL DEVICES OFF: LED off, buzzer silent, displays cleared, sensor stopped"
 
 # ============================================================================
@@ -999,10 +1743,12 @@ def welcome_message(name: str) -> str:
     Args:
         name: The name to display in the welcome message (max 16 characters)
     """
-    send_command("LCD:CLEAR")
-    send_command(f"LCD:LINE1:Welcome!")
-    send_command(f"LCD:LINE2:{name[:16]}")
-    send_command("BUZZER:BEEP:200")
+    send_commands([
+        "LCD:CLEAR",
+        "LCD:LINE1:Welcome!",
+        f"LCD:LINE2:{name:.16}",
+        "BUZZER:BEEP:200",
+    ])
     return f"Welcome sequence completed: 'Welcome! {name}' displayed on LCD with greeting beep"
 
 @mcp.tool()
@@ -1027,6 +1773,10 @@ def proximity_alert() -> str:
     - LCD: "Clear" + distance
     - Status: ✓ All Clear
     
+    The thresholds run on the Arduino: after the first call it keeps switching
+    between these states on its own (with a 2cm hysteresis) until
+    ultrasonic_stop() or all_off(). Every call takes a fresh reading.
+    
     Use cases:
     - Automatic proximity detection
     - Collision prevention
@@ -1035,38 +1785,25 @@ def proximity_alert() -> str:
     
     Returns: Current distance and alert status with actions taken
     """
-    arduino = get_arduino()
-    send_command("ULTRA:READ")
-    time.sleep(0.1)
-    
-    distance = -1
-    if arduino.in_waiting > 0:
-        response = arduino.readline().decode('utf-8').strip()
-        if response.startswith("ULTRA:"):
-            try:
-                distance = float(response.split(':')[1])
-            except:
-                pass
-    
-    if distance < 0:
-        return "ERROR: Could not read distance from ultrasonic sensor"
-    elif distance < 10:
-        send_command("BUZZER:ON")
-        send_command("LED:BLINK:100")
-        send_command(f"LCD:LINE1:WARNING!")
-        send_command(f"LCD:LINE2:Too Close!")
+    # The Arduino applies the thresholds itself (PROX:AUTO) and pushes an ALERT:
+    # on every state change - arm it once; the first ALERT: follows the ack
+    if arduino_state["proximity"] is None:
+        _proximity_event.clear()
+        send_command_now(f"PROX:AUTO:{PROX_CRITICAL_CM}:{PROX_WARN_CM}")
+        if not _proximity_event.wait(REPLY_TIMEOUT) or arduino_state["proximity"] is None:
+            send_command_now("PROX:OFF")  # Don't leave an alarm armed that we can't report on
+            return "ERROR: Could not read distance from ultrasonic sensor"
+    
+    # ALERT: only comes on state changes - take a fresh reading for the report
+    distance = _read_distance()
+    if distance is None or distance < 0:
+        return "ERROR: Could not read distance from ultrasonic sensor (alarm stays armed)"
+    state = _proximity_state(distance, arduino_state["proximity"])
+    if state == "CRITICAL":
         return f"⚠️ CRITICAL ALERT! Object at {distance:.2f}cm - Buzzer ON, LED fast blinking, warning displayed"
-    elif distance < 30:
-        send_command("BUZZER:OFF")
-        send_command("LED:ON")
-        send_command(f"LCD:LINE1:Caution")
-        send_command(f"LCD:LINE2:{distance:.1f} cm")
+    elif state == "WARN":
         return f"⚠ Warning: Object at {distance:.2f}cm - LED ON, caution displayed"
     else:
-        send_command("LED:OFF")
-        send_command("BUZZER:OFF")
-        send_command(f"LCD:LINE1:Clear")
-        send_command(f"LCD:LINE2:{distance:.1f} cm")
         return f"✓ All Clear - Distance: {distance:.2f}cm - No threats detected"
 
 @mcp.tool()
@@ -1098,11 +1835,9 @@ def countdown_display(seconds: int) -> str:
     if seconds < 0 or seconds > 5940:
         return "Error: Seconds must be between 0 and 5940 (99 minutes max)"
     
-    mins = seconds // 60
-    secs = seconds % 60
-    time_str = f"{mins:02d}{secs:02d}"
-    send_command(f"TM1637:NUM:{time_str}")
-    return f"Countdown initialized: {mins:02d}:{secs:02d} displayed on 7-segment ({seconds} total seconds)"
+    mins, secs = _DIGIT_PAIRS[seconds // 60], _DIGIT_PAIRS[seconds % 60]
+    send_command("TM1637:NUM:" + mins + secs)
+    return f"Countdown initialized: {mins}:{secs} displayed on 7-segment ({seconds} total seconds)"
 
 @mcp.tool()
 def display_info(title: str, value: str, show_number: Optional[int] = None) -> str:
@@ -1136,10 +1871,11 @@ def display_info(title: str, value: str, show_number: Optional[int] = None) -> s
         value: Data/value for LCD line 2 (max 16 chars)
         show_number: Optional number for 7-segment display (-999 to 9999)
     """
-    send_command(f"LCD:LINE1:{title[:16]}")
-    send_command(f"LCD:LINE2:{value[:16]}")
+    commands = [f"LCD:LINE1:{title:.16}", f"LCD:LINE2:{value:.16}"]
+    if show_number is not None:
+        commands.append(f"TM1637:NUM:{show_number}")
+    send_commands(commands)
     if show_number is not None:
-        send_command(f"TM1637:NUM:{show_number}")
         return f"Multi-display info: LCD shows '{title}' / '{value}', 7-segment shows {show_number}"
     else:
         return f"Multi-display info: LCD shows '{title}' / '{value}'"
@@ -1167,22 +1903,60 @@ def celebration() -> str:
     
     Use this when something awesome happens!
     """
-    send_command("LCD:LINE1:Celebration!")
-    send_command("LCD:LINE2:Hooray!")
-    send_command("LED:BLINK:200")
-    
-    # Three beeps in sequence
-    for i in range(3):
-        send_command("BUZZER:BEEP:150")
-        time.sleep(0.3)
-    
-    send_command("TM1637:NUM:8888")
+    send_commands([
+        "LCD:LINE1:Celebration!",
+        "LCD:LINE2:Hooray!",
+        "LED:BLINK:200",
+        "TM1637:NUM:8888",
+        "BUZZER:PATTERN:150,300,3",  # Three beeps, sequenced by the Arduino
+    ])
     return "🎉 CELEBRATION SEQUENCE ACTIVATED! LCD message, LED blinking, 3 beeps, display lit - party time!"
 
 # ============================================================================
 # CONDITIONAL EXECUTION TOOLS (Complex Scenarios)
 # ============================================================================
 
+# Action parameter parsers for the when_* tools: action_params -> (params, error)
+
+def _parse_beep(action_params: str):
+    try:
+        return {"duration": int(action_params) if action_params else 1000}, None
+    except ValueError:
+        return None, "Error: Beep duration must be a whole number of milliseconds (e.g., '1000')"
+
+def _parse_timer(action_params: str):
+    # Format: MM:SS
+    match = _MMSS_RE.match(action_params)
+    if not match:
+        return None, "Error: Timer format must be MM:SS (e.g., '02:00' for 2 minutes)"
+    minutes, seconds = match.group(1, 2)
+    return {"minutes": int(minutes), "seconds": int(seconds)}, None
+
+def _parse_blink(action_params: str):
+    try:
+        return {"interval": int(action_params) if action_params else 1000}, None
+    except ValueError:
+        return None, "Error: Blink interval must be a whole number of milliseconds (e.g., '500')"
+
+def _parse_message(action_params: str):
+    # Format: Line1|Line2
+    line1, _, line2 = action_params.partition("|")
+    return {"line1": line1, "line2": line2}, None
+
+def _parse_custom(action_params: str):
+    # Raw protocol command, e.g. "LED:ON"
+    if not action_params:
+        return None, "Error: custom_command needs the command to send (e.g., 'LED:ON')"
+    return {"command": action_params}, None
+
+_ACTION_PARSERS = {
+    "buzzer_beep": _parse_beep,
+    "start_timer": _parse_timer,
+    "led_blink": _parse_blink,
+    "display_message": _parse_message,
+    "custom_command": _parse_custom,
+}
+
 @mcp.tool()
 def when_timer_finishes(then_action: str, action_params: Optional[str] = "") -> str:
     """
@@ -1191,7 +1965,8 @@ def when_timer_finishes(then_action: str, action_params: Optional[str] = "") ->
     AI USAGE: Call this IMMEDIATELY after display_timer() to set up automatic actions.
     Background monitor detects timer completion and executes WITHOUT further commands.
     
-    Actions: "buzzer_beep", "start_timer", "led_blink", "display_message"
+    Actions: "buzzer_beep", "start_timer", "led_blink", "display_message",
+             "custom_command" (action_params is the raw command, e.g. "LED:ON")
     
     Examples:
     - when_timer_finishes("buzzer_beep", "1000") → Beep 1 sec when timer→0
@@ -1206,28 +1981,13 @@ def when_timer_finishes(then_action: str, action_params: Optional[str] = "") ->
     
     Returns: Confirmation of queued action
     """
-    global pending_actions
-    
     # Parse action parameters
-    params = {}
-    if then_action == "buzzer_beep":
-        params = {"duration": int(action_params) if action_params else 1000}
-    elif then_action == "start_timer":
-        # Format: MM:SS
-        if ":" in action_params:
-            parts = action_params.split(":")
-            params = {"minutes": int(parts[0]), "seconds": int(parts[1])}
-        else:
-            return "Error: Timer format must be MM:SS (e.g., '02:00' for 2 minutes)"
-    elif then_action == "led_blink":
-        params = {"interval": int(action_params) if action_params else 1000}
-    elif then_action == "display_message":
-        # Format: Line1|Line2
-        if "|" in action_params:
-            parts = action_params.split("|")
-            params = {"line1": parts[0], "line2": parts[1]}
-        else:
-            params = {"line1": action_params, "line2": ""}
+    parser = _ACTION_PARSERS.get(then_action)
+    if parser is None:
+        return f"Error: Unknown action '{then_action}' (use one of: {', '.join(_ACTION_PARSERS)})"
+    params, error = parser(action_params or "")
+    if error:
+        return error
     
     # Add to pending actions
     action = {
@@ -1235,7 +1995,8 @@ def when_timer_finishes(then_action: str, action_params: Optional[str] = "") ->
         "action_type": then_action,
         "params": params
     }
-    pending_actions.append(action)
+    if not add_pending_action(action):
+        return f"Error: Too many pending actions for this trigger (max {MAX_PENDING_ACTIONS}). Clear some with clear_all_pending_actions()."
     
     return f"✅ CONDITIONAL ACTION SET: When timer reaches 0 → Execute '{then_action}' with params: {params}. The system will monitor and execute automatically!"
 
@@ -1259,30 +2020,17 @@ def when_time_equals(target_time: str, then_action: str, action_params: Optional
     
     Returns: Confirmation of time-based trigger
     """
-    global pending_actions
-    
     # Validate time format
-    if not re.match(r'^\d{2}:\d{2}:\d{2}$', target_time):
+    if not _TIME_RE.match(target_time):
         return "Error: Time must be in HH:MM:SS format (e.g., '14:30:00')"
     
-    # Parse action parameters (same as when_timer_finishes)
-    params = {}
-    if then_action == "buzzer_beep":
-        params = {"duration": int(action_params) if action_params else 1000}
-    elif then_action == "start_timer":
-        if ":" in action_params:
-            parts = action_params.split(":")
-            params = {"minutes": int(parts[0]), "seconds": int(parts[1])}
-        else:
-            return "Error: Timer format must be MM:SS"
-    elif then_action == "led_blink":
-        params = {"interval": int(action_params) if action_params else 1000}
-    elif then_action == "display_message":
-        if "|" in action_params:
-            parts = action_params.split("|")
-            params = {"line1": parts[0], "line2": parts[1]}
-        else:
-            params = {"line1": action_params, "line2": ""}
+    # Parse action parameters
+    parser = _ACTION_PARSERS.get(then_action)
+    if parser is None:
+        return f"Error: Unknown action '{then_action}' (use one of: {', '.join(_ACTION_PARSERS)})"
+    params, error = parser(action_params or "")
+    if error:
+        return error
     
     # Add to pending actions
     action = {
@@ -1291,7 +2039,8 @@ def when_time_equals(target_time: str, then_action: str, action_params: Optional
         "action_type": then_action,
         "params": params
     }
-    pending_actions.append(action)
+    if not add_pending_action(action):
+        return f"Error: Too many pending actions for this trigger (max {MAX_PENDING_ACTIONS}). Clear some with clear_all_pending_actions()."
     
     return f"✅ TIME-BASED TRIGGER SET: When clock reaches {target_time} → Execute '{then_action}'. Make sure LCD clock is running (lcd_show_current_time)!"
 
@@ -1312,26 +2061,13 @@ def when_distance_less_than(distance_cm: float, then_action: str, action_params:
     
     Returns: Confirmation of proximity trigger
     """
-    global pending_actions
-    
     # Parse action parameters
-    params = {}
-    if then_action == "buzzer_beep":
-        params = {"duration": int(action_params) if action_params else 1000}
-    elif then_action == "start_timer":
-        if ":" in action_params:
-            parts = action_params.split(":")
-            params = {"minutes": int(parts[0]), "seconds": int(parts[1])}
-        else:
-            return "Error: Timer format must be MM:SS"
-    elif then_action == "led_blink":
-        params = {"interval": int(action_params) if action_params else 1000}
-    elif then_action == "display_message":
-        if "|" in action_params:
-            parts = action_params.split("|")
-            params = {"line1": parts[0], "line2": parts[1]}
-        else:
-            params = {"line1": action_params, "line2": ""}
+    parser = _ACTION_PARSERS.get(then_action)
+    if parser is None:
+        return f"Error: Unknown action '{then_action}' (use one of: {', '.join(_ACTION_PARSERS)})"
+    params, error = parser(action_params or "")
+    if error:
+        return error
     
     # Add to pending actions
     action = {
@@ -1340,7 +2076,8 @@ def when_distance_less_than(distance_cm: float, then_action: str, action_params:
         "action_type": then_action,
         "params": params
     }
-    pending_actions.append(action)
+    if not add_pending_action(action):
+        return f"Error: Too many pending actions for this trigger (max {MAX_PENDING_ACTIONS}). Clear some with clear_all_pending_actions()."
     
     return f"✅ PROXIMITY TRIGGER SET: When distance < {distance_cm}cm → Execute '{then_action}'. Make sure ultrasonic is active (ultrasonic_start)!"
 
@@ -1354,21 +2091,8 @@ def show_live_ultrasonic_on_lcd() -> str:
     
     Returns: Confirmation
     """
-    # Start ultrasonic monitoring
-    send_command("ULTRA:START")
-    
-    # The background monitor will receive DISTANCE: messages
-    # and we'll update the LCD in the monitoring thread
-    
-    # Add a special action that continuously updates LCD with distance
-    global pending_actions
-    pending_actions.append({
-        "trigger": "distance_update",
-        "action_type": "update_lcd_distance",
-        "params": {}
-    })
-    
-    send_command("LCD:LINE1:Distance:")
+    # Start ultrasonic monitoring; the Arduino renders each reading on LCD line 2 itself
+    send_commands(["ULTRA:START", "LCD:LINE1:Distance:", "LCD:FOLLOW:DISTANCE"])
     
     return "✅ LIVE ULTRASONIC MONITORING STARTED! LCD will continuously show distance. Arduino sends distance every 500ms and LCD updates automatically. To stop: lcd_clear() or ultrasonic_stop()"
 
@@ -1378,7 +2102,21 @@ def get_current_status() -> str:
     Get real-time system status: timer, clock, distance, pending actions.
     Use to verify what's running and what actions are queued.
     """
-    global arduino_state, pending_actions
+    now = time.monotonic()
+    age = f"\n\n📊 Last Update: {now - arduino_state['last_update']:.1f} seconds ago\n" + "=" * 60
+    
+    # Rebuilt only after a state / pending-action change (or every STATUS_CACHE_TTL)
+    cached = arduino_state["_status_cache"]
+    if cached is not None and now - cached[0] < STATUS_CACHE_TTL:
+        return cached[1] + age
+    body = _render_status()
+    arduino_state["_status_cache"] = (now, body)
+    return body + age
+
+def _render_status() -> str:
+    """get_current_status report, minus the last-update line"""
+    with pending_lock:
+        actions = _all_pending_actions()
     
     status = []
     status.append("=" * 60)
@@ -1406,8 +2144,8 @@ def get_current_status() -> str:
         status.append("📏 Distance: NOT MONITORING")
     
     # Pending actions
-    status.append(f"\n⚡ Pending Conditional Actions: {len(pending_actions)}")
-    for i, action in enumerate(pending_actions, 1):
+    status.append(f"\n⚡ Pending Conditional Actions: {len(actions)}")
+    for i, action in enumerate(actions, 1):
         trigger = action.get("trigger")
         action_type = action.get("action_type")
         
@@ -1420,9 +2158,6 @@ def get_current_status() -> str:
             target = action.get("target_distance")
             status.append(f"  {i}. When distance < {target}cm: Execute '{action_type}'")
     
-    status.append(f"\n📊 Last Update: {time.time() - arduino_state['last_update']:.1f} seconds ago")
-    status.append("=" * 60)
-    
     return "\n".join(status)
 
 @mcp.tool()
@@ -1431,10 +2166,12 @@ def clear_all_pending_actions() -> str:
     Clear all queued conditional actions. Devices keep running normally.
     Use to reset automation system or cancel pending triggers.
     """
-    global pending_actions
-    count = len(pending_actions)
-    pending_actions.clear()
-    return f"✅ Cleared {count} pending conditional action(s). All timers, clocks, and sensors still running normally."
+    with pending_lock:
+        pending = len(_all_pending_actions())
+        for queued in pending_actions.values():
+            queued.clear()
+        arduino_state["_status_cache"] = None
+    return f"✅ Cleared {pending} pending conditional action(s). All timers, clocks, and sensors still running normally."
 
 if __name__ == "__main__":
     mcp.run()
@@ -14,13 +14,29 @@
 //   LED:BLINK:500 (blink with 500ms interval)
 //   BUZZER:ON or BUZZER:OFF
 //   BUZZER:BEEP:1000 (beep for 1000ms)
+//   BUZZER:PATTERN:150,300,3 (3 beeps: 150ms on, 300ms off - played without blocking)
 //   LCD:LINE1:Hello World
 //   LCD:LINE2:Test
 //   LCD:CLEAR
 //   TM1637:NUM:1234
 //   TM1637:CLEAR
 //   ULTRA:START or ULTRA:STOP
+//   ULTRA:READ:42 (one reading, echoing the request's sequence number: ULTRA:42:<cm>)
 //   STATUS (get status of all devices)
+//   SYNC:EPOCH:1700000000:330 (set wall clock: unix seconds, UTC offset in minutes)
+//   LCD:CLOCK / TM1637:CLOCK (render the synced wall clock locally)
+//   LCD:FOLLOW:DISTANCE (show each ultrasonic reading on LCD line 2)
+//   PROX:AUTO:10:30 (local proximity alarm: critical / warning cm), PROX:OFF
+//     -> pushes ALERT:CRITICAL:<cm>, ALERT:WARN:<cm>, ALERT:CLEAR:<cm> on state changes
+//        and ALERT:OFF when disarmed (PROX:OFF or ULTRA:STOP)
+//   PROTO:BINARY / PROTO:ASCII (status and replies as binary frames / text lines)
+//
+// Binary frames (accepted any time): 0xAA <op> <len> <payload> <crc8>
+//   crc8 = CRC-8 (poly 0x07, init 0) over op, len and payload;
+//   integers are little-endian, distances are u16 cm*100 (0xFFFF = no echo).
+//   A binary command is acknowledged with an ACK frame carrying its opcode.
+//
+// On boot the sketch prints "READY" once setup() is done.
 
 #include <Wire.h>
 #include <LiquidCrystal_I2C.h>
@@ -49,20 +65,46 @@ unsigned long lastLedBlink = 0;
 bool buzzerState = false;
 unsigned long buzzerStopTime = 0;
 
+// Buzzer pattern (BUZZER:PATTERN) - played from loop()
+unsigned long buzzerPatternOnMs = 0;
+unsigned long buzzerPatternOffMs = 0;
+int buzzerPatternBeepsLeft = 0; // Including the one sounding now
+unsigned long buzzerPatternPhaseStart = 0;
+
 bool ultrasonicActive = false;
 unsigned long lastUltrasonicRead = 0;
 const unsigned long ultrasonicInterval = 200;
 
+// Proximity alarm (PROX:AUTO) - thresholds checked here, only state changes are reported
+const uint8_t PROX_OFF = 0;
+const uint8_t PROX_CLEAR = 1;
+const uint8_t PROX_WARN = 2;
+const uint8_t PROX_CRITICAL = 3;
+const char* const PROX_STATE_NAMES[] = {"OFF", "CLEAR", "WARN", "CRITICAL"};
+const float proxHysteresisCm = 2.0; // Must move this far back out before a state is left
+bool proxActive = false;
+uint8_t proxState = PROX_OFF;
+float proxCriticalCm = 10;
+float proxWarnCm = 30;
+unsigned long lastProxCheck = 0;
+const unsigned long proxInterval = 200;
+
+// Wall clock (set once by SYNC:EPOCH, then ticks on millis())
+unsigned long clockEpoch = 0;       // Local seconds since 1970-01-01 at last sync
+unsigned long clockSyncMillis = 0;  // millis() at last sync
+const char* const DAY_NAMES[] = {"Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"};
+
 // LCD Clock state
 bool lcdClockActive = false;
 int lcdClockHours = 0;
 int lcdClockMinutes = 0;
 int lcdClockSeconds = 0;
-String lcdClockDate = "";
-String lcdClockDay = "";
 unsigned long lastLcdClockUpdate = 0;
 const unsigned long lcdClockInterval = 1000; // Update every second
 
+// LCD live distance (line 2 follows ultrasonic readings)
+bool lcdFollowDistance = false;
+
 // LCD Stopwatch state
 bool lcdStopwatchActive = false;
 unsigned long lcdStopwatchStartTime = 0;
@@ -70,8 +112,6 @@ unsigned long lastLcdStopwatchUpdate = 0;
 
 // TM1637 Clock state
 bool tm1637ClockActive = false;
-int tm1637ClockHours = 0;
-int tm1637ClockMinutes = 0;
 unsigned long lastTm1637ClockUpdate = 0;
 const unsigned long tm1637ClockInterval = 1000; // Update every second
 
@@ -91,8 +131,45 @@ const unsigned long countdownInterval = 1000; // Update every second
 unsigned long lastStatusReport = 0;
 const unsigned long statusReportInterval = 500; // Send status every 500ms
 
+// Binary protocol (set to 0 for a text-only build, e.g. to debug from the Serial Monitor)
+#define ENABLE_BINARY_PROTOCOL 1
+const uint8_t FRAME_START = 0xAA;
+const uint8_t FRAME_MAX_PAYLOAD = 32;
+
+// Host -> Arduino opcodes
+const uint8_t OP_LED_ON = 0x01;
+const uint8_t OP_LED_OFF = 0x02;
+const uint8_t OP_LED_BLINK = 0x03;          // u16 interval ms
+const uint8_t OP_LED_TOGGLE = 0x04;
+const uint8_t OP_BUZZER_ON = 0x10;
+const uint8_t OP_BUZZER_OFF = 0x11;
+const uint8_t OP_BUZZER_BEEP = 0x12;        // u16 duration ms
+const uint8_t OP_LCD_LINE1 = 0x20;          // text
+const uint8_t OP_LCD_LINE2 = 0x21;          // text
+const uint8_t OP_LCD_CLEAR = 0x22;
+const uint8_t OP_TM1637_NUM = 0x30;         // i16
+const uint8_t OP_TM1637_CLEAR = 0x31;
+const uint8_t OP_TM1637_BRIGHTNESS = 0x32;  // u8
+const uint8_t OP_TM1637_COUNTDOWN = 0x33;   // u16 seconds
+const uint8_t OP_TM1637_DIGITS = 0x34;      // 2 bytes BCD, drawn with the colon (0x01 0x30 = 01:30)
+const uint8_t OP_ULTRA_START = 0x40;
+const uint8_t OP_ULTRA_STOP = 0x41;
+const uint8_t OP_ULTRA_READ = 0x42;
+
+// Arduino -> host opcodes
+const uint8_t OP_ACK = 0x80;                // u8 opcode acknowledged
+const uint8_t OP_TIMER_REMAINING = 0x81;    // u16 seconds
+const uint8_t OP_COUNTDOWN_FINISHED = 0x82;
+const uint8_t OP_CLOCK = 0x83;              // u8 hours, minutes, seconds
+const uint8_t OP_DISTANCE = 0x84;           // u16 cm*100
+const uint8_t OP_ULTRA = 0x85;              // [u8 seq] u16 cm*100 (ULTRA:READ reply)
+const uint8_t OP_ALERT = 0x86;              // u8 PROX_* state, u16 cm*100
+
+bool binaryStatus = false;   // Report status as frames (PROTO:BINARY)
+uint8_t currentFrameOp = 0;  // Opcode of the frame being handled, 0 for text commands
+
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(115200);
   
   // Initialize LCD
   lcd.init();
@@ -117,11 +194,18 @@ void setup() {
   
   delay(1000);
   lcd.clear();
+  
+  // Tell the host we're ready for commands (replaces a fixed wait after reset)
+  Serial.println("READY");
 }
 
 void loop() {
-  // Handle serial commands
-  if (Serial.available() > 0) {
+  // Handle serial commands (drain every queued line - host may batch several per write)
+  while (Serial.available() > 0) {
+    if (ENABLE_BINARY_PROTOCOL && Serial.peek() == FRAME_START) {
+      readFrame();
+      continue;
+    }
     String command = Serial.readStringUntil('\n');
     command.trim();
     processCommand(command);
@@ -144,32 +228,39 @@ void loop() {
     buzzerStopTime = 0;
   }
   
+  // Handle buzzer pattern
+  if (buzzerPatternBeepsLeft > 0) {
+    unsigned long elapsed = millis() - buzzerPatternPhaseStart;
+    if (buzzerState && elapsed >= buzzerPatternOnMs) {
+      digitalWrite(BUZZER_PIN, LOW);
+      buzzerState = false;
+      buzzerPatternBeepsLeft--;
+      buzzerPatternPhaseStart = millis();
+    } else if (!buzzerState && elapsed >= buzzerPatternOffMs) {
+      digitalWrite(BUZZER_PIN, HIGH);
+      buzzerState = true;
+      buzzerPatternPhaseStart = millis();
+    }
+  }
+  
   // Handle ultrasonic readings
   if (ultrasonicActive && (millis() - lastUltrasonicRead >= ultrasonicInterval)) {
     lastUltrasonicRead = millis();
-    float distance = getUltrasonicDistance();
-    Serial.print("ULTRA:");
-    Serial.print(distance);
-    Serial.println();
+    reportDistance(OP_ULTRA, "ULTRA:", getUltrasonicDistance());
   }
   
-  // Handle LCD Clock (ACTUAL TIME from PC)
+  // Handle proximity alarm
+  if (proxActive && (millis() - lastProxCheck >= proxInterval)) {
+    lastProxCheck = millis();
+    updateProximity(getUltrasonicDistance());
+  }
+  
+  // Handle LCD Clock (ACTUAL TIME synced from PC)
   if (lcdClockActive && (millis() - lastLcdClockUpdate >= lcdClockInterval)) {
     lastLcdClockUpdate = millis();
     
-    // Increment seconds (PC sends actual time, we just tick)
-    lcdClockSeconds++;
-    if (lcdClockSeconds >= 60) {
-      lcdClockSeconds = 0;
-      lcdClockMinutes++;
-      if (lcdClockMinutes >= 60) {
-        lcdClockMinutes = 0;
-        lcdClockHours++;
-        if (lcdClockHours >= 24) {
-          lcdClockHours = 0;
-        }
-      }
-    }
+    unsigned long now = clockNow();
+    updateLcdClockTime(now);
     
     // Display: Line 1 = Time, Line 2 = Date + Day
     lcd.setCursor(0, 0);
@@ -184,12 +275,17 @@ void loop() {
     if (lcdClockSeconds < 10) lcd.print("0");
     lcd.print(lcdClockSeconds);
     
+    // Date + day derived from the synced epoch: MM/DD/YYYY Ddd
+    int year, month, day;
+    unsigned long days = now / 86400UL;
+    civilFromDays(days, year, month, day);
+    char dateStr[17];
+    sprintf(dateStr, "%02d/%02d/%04d %s", month, day, year, DAY_NAMES[(days + 4) % 7]);
+    
     lcd.setCursor(0, 1);
     lcd.print("                "); // Clear line
     lcd.setCursor(0, 1);
-    lcd.print(lcdClockDate); // Date sent from PC
-    lcd.print(" ");
-    lcd.print(lcdClockDay); // Day sent from PC
+    lcd.print(dateStr);
   }
   
   // Handle LCD Stopwatch (COUNT UP from 00:00:00)
@@ -215,28 +311,17 @@ void loop() {
     lcd.print("        ");
   }
   
-  // Handle TM1637 Clock (ACTUAL TIME - HH:MM only)
+  // Handle TM1637 Clock (ACTUAL TIME synced from PC - HH:MM only)
   if (tm1637ClockActive && (millis() - lastTm1637ClockUpdate >= tm1637ClockInterval)) {
     lastTm1637ClockUpdate = millis();
     
-    // Increment seconds internally, update display every minute
-    static int tm1637Seconds = 0;
-    tm1637Seconds++;
-    if (tm1637Seconds >= 60) {
-      tm1637Seconds = 0;
-      tm1637ClockMinutes++;
-      if (tm1637ClockMinutes >= 60) {
-        tm1637ClockMinutes = 0;
-        tm1637ClockHours++;
-        if (tm1637ClockHours >= 24) {
-          tm1637ClockHours = 0;
-        }
-      }
-    }
+    unsigned long secondOfDay = clockNow() % 86400UL;
+    int hours = secondOfDay / 3600;
+    int minutes = (secondOfDay / 60) % 60;
     
     // Display HH:MM format
     char timeStr[5];
-    sprintf(timeStr, "%02d%02d", tm1637ClockHours, tm1637ClockMinutes);
+    sprintf(timeStr, "%02d%02d", hours, minutes);
     
     uint8_t data[4];
     data[0] = tm1637.encodeDigit(timeStr[0] - '0');
@@ -281,14 +366,9 @@ void loop() {
       tm1637.setSegments(data);
       
       // Quick beeps
-      for (int i = 0; i < 3; i++) {
-        digitalWrite(BUZZER_PIN, HIGH);
-        delay(100);
-        digitalWrite(BUZZER_PIN, LOW);
-        delay(100);
-      }
+      startBuzzerPattern(100, 100, 3);
       
-      Serial.println("COUNTDOWN:FINISHED");
+      reportCountdownFinished();
     } else {
       // Display MM:SS format
       int mins = remainingSeconds / 60;
@@ -305,8 +385,7 @@ void loop() {
       tm1637.setSegments(data);
       
       // Send remaining time to Python
-      Serial.print("TIMER:REMAINING:");
-      Serial.println(remainingSeconds);
+      reportTimerRemaining(remainingSeconds);
     }
   }
   
@@ -323,32 +402,54 @@ void sendAutoStatus() {
     unsigned long elapsedSeconds = (millis() - countdownStartTime) / 1000;
     int remainingSeconds = countdownSeconds - elapsedSeconds;
     if (remainingSeconds > 0) {
-      Serial.print("TIMER:REMAINING:");
-      Serial.println(remainingSeconds);
+      reportTimerRemaining(remainingSeconds);
     }
   }
   
   // Send current time if clock is active
   if (lcdClockActive) {
-    Serial.print("CLOCK:LCD:");
-    if (lcdClockHours < 10) Serial.print("0");
-    Serial.print(lcdClockHours);
-    Serial.print(":");
-    if (lcdClockMinutes < 10) Serial.print("0");
-    Serial.print(lcdClockMinutes);
-    Serial.print(":");
-    if (lcdClockSeconds < 10) Serial.print("0");
-    Serial.println(lcdClockSeconds);
+    updateLcdClockTime(clockNow());
+    reportClock();
   }
   
   // Send ultrasonic distance if active
   if (ultrasonicActive) {
     float distance = getUltrasonicDistance();
-    Serial.print("DISTANCE:");
-    Serial.println(distance);
+    reportDistance(OP_DISTANCE, "DISTANCE:", distance);
+    
+    if (lcdFollowDistance) {
+      lcd.setCursor(0, 1);
+      lcd.print(distance, 2);
+      lcd.print(" cm       ");
+    }
   }
 }
 
+// Current local time in seconds since 1970-01-01 (from the last SYNC:EPOCH)
+unsigned long clockNow() {
+  return clockEpoch + (millis() - clockSyncMillis) / 1000UL;
+}
+
+void updateLcdClockTime(unsigned long now) {
+  unsigned long secondOfDay = now % 86400UL;
+  lcdClockHours = secondOfDay / 3600;
+  lcdClockMinutes = (secondOfDay / 60) % 60;
+  lcdClockSeconds = secondOfDay % 60;
+}
+
+// Days since 1970-01-01 -> calendar date (Howard Hinnant's civil_from_days)
+void civilFromDays(unsigned long days, int &year, int &month, int &day) {
+  long z = (long)days + 719468L;
+  long era = z / 146097L;
+  unsigned long doe = (unsigned long)(z - era * 146097L);
+  unsigned long yoe = (doe - doe / 1460 + doe / 36524 - doe / 146096) / 365;
+  unsigned long doy = doe - (365 * yoe + yoe / 4 - yoe / 100);
+  unsigned long mp = (5 * doy + 2) / 153;
+  day = doy - (153 * mp + 2) / 5 + 1;
+  month = mp < 10 ? mp + 3 : mp - 9;
+  year = yoe + era * 400 + (month <= 2 ? 1 : 0);
+}
+
 void processCommand(String cmd) {
   // Parse command format: DEVICE:ACTION:VALUE
   int firstColon = cmd.indexOf(':');
@@ -377,7 +478,13 @@ void processCommand(String cmd) {
   } else if (device == "TM1637" || device == "DISPLAY") {
     handleTM1637(action, value);
   } else if (device == "ULTRA") {
-    handleUltrasonic(action);
+    handleUltrasonic(action, value);
+  } else if (device == "SYNC") {
+    handleSync(action, value);
+  } else if (device == "PROX") {
+    handleProximity(action, value);
+  } else if (device == "PROTO") {
+    handleProto(action);
   } else if (device == "STATUS") {
     sendStatus();
   } else {
@@ -390,24 +497,22 @@ void handleLED(String action, String value) {
     ledBlinking = false;
     digitalWrite(LED_PIN, HIGH);
     ledState = true;
-    Serial.println("OK:LED:ON");
+    ack("LED:ON");
   } else if (action == "OFF") {
     ledBlinking = false;
     digitalWrite(LED_PIN, LOW);
     ledState = false;
-    Serial.println("OK:LED:OFF");
+    ack("LED:OFF");
   } else if (action == "BLINK") {
     ledBlinking = true;
     ledBlinkInterval = value.length() > 0 ? value.toInt() : 500;
     lastLedBlink = millis();
-    Serial.print("OK:LED:BLINK:");
-    Serial.println(ledBlinkInterval);
+    ack("LED:BLINK:", ledBlinkInterval);
   } else if (action == "TOGGLE") {
     if (!ledBlinking) {
       ledState = !ledState;
       digitalWrite(LED_PIN, ledState ? HIGH : LOW);
-      Serial.print("OK:LED:TOGGLE:");
-      Serial.println(ledState ? "ON" : "OFF");
+      ack("LED:TOGGLE:", ledState ? "ON" : "OFF");
     }
   }
 }
@@ -417,19 +522,45 @@ void handleBuzzer(String action, String value) {
     digitalWrite(BUZZER_PIN, HIGH);
     buzzerState = true;
     buzzerStopTime = 0;
-    Serial.println("OK:BUZZER:ON");
+    buzzerPatternBeepsLeft = 0; // Cancel any pattern
+    ack("BUZZER:ON");
   } else if (action == "OFF") {
     digitalWrite(BUZZER_PIN, LOW);
     buzzerState = false;
     buzzerStopTime = 0;
-    Serial.println("OK:BUZZER:OFF");
+    buzzerPatternBeepsLeft = 0; // Cancel any pattern
+    ack("BUZZER:OFF");
   } else if (action == "BEEP") {
     int duration = value.length() > 0 ? value.toInt() : 100;
     digitalWrite(BUZZER_PIN, HIGH);
     buzzerState = true;
     buzzerStopTime = millis() + duration;
-    Serial.print("OK:BUZZER:BEEP:");
-    Serial.println(duration);
+    buzzerPatternBeepsLeft = 0; // Cancel any pattern
+    ack("BUZZER:BEEP:", duration);
+  } else if (action == "PATTERN") {
+    // Format: PATTERN:on_ms,off_ms,repeats
+    int firstComma = value.indexOf(',');
+    int secondComma = value.indexOf(',', firstComma + 1);
+    if (firstComma == -1 || secondComma == -1) {
+      Serial.println("ERROR:Pattern format is on_ms,off_ms,repeats");
+      return;
+    }
+    startBuzzerPattern(value.substring(0, firstComma).toInt(),
+                       value.substring(firstComma + 1, secondComma).toInt(),
+                       value.substring(secondComma + 1).toInt());
+    ack("BUZZER:PATTERN");
+  }
+}
+
+void startBuzzerPattern(unsigned long onMs, unsigned long offMs, int repeats) {
+  buzzerPatternOnMs = onMs;
+  buzzerPatternOffMs = offMs;
+  buzzerPatternBeepsLeft = repeats;
+  buzzerStopTime = 0;
+  if (repeats > 0) {
+    digitalWrite(BUZZER_PIN, HIGH);
+    buzzerState = true;
+    buzzerPatternPhaseStart = millis();
   }
 }
 
@@ -441,61 +572,63 @@ void handleLCD(String action, String value) {
     lcd.print("                "); // Clear line
     lcd.setCursor(0, 0);
     lcd.print(value.substring(0, 16));
-    Serial.println("OK:LCD:LINE1");
+    ack("LCD:LINE1");
   } else if (action == "LINE2") {
     lcdClockActive = false; // Stop clock if active
     lcdStopwatchActive = false; // Stop stopwatch if active
+    lcdFollowDistance = false; // Stop live distance if active
     lcd.setCursor(0, 1);
     lcd.print("                "); // Clear line
     lcd.setCursor(0, 1);
     lcd.print(value.substring(0, 16));
-    Serial.println("OK:LCD:LINE2");
+    ack("LCD:LINE2");
   } else if (action == "CLEAR") {
     lcdClockActive = false; // Stop clock if active
     lcdStopwatchActive = false; // Stop stopwatch if active
+    lcdFollowDistance = false; // Stop live distance if active
     lcd.clear();
-    Serial.println("OK:LCD:CLEAR");
+    ack("LCD:CLEAR");
   } else if (action == "BACKLIGHT") {
     if (value == "ON") {
       lcd.backlight();
-      Serial.println("OK:LCD:BACKLIGHT:ON");
+      ack("LCD:BACKLIGHT:ON");
     } else if (value == "OFF") {
       lcd.noBacklight();
-      Serial.println("OK:LCD:BACKLIGHT:OFF");
+      ack("LCD:BACKLIGHT:OFF");
     }
   } else if (action == "CLOCK") {
-    // Format: CLOCK:HH:MM:SS:Date:Day
-    // Example: CLOCK:14:30:45:07/12/2025:Sat
+    // Renders the wall clock set by SYNC:EPOCH (send that first)
     lcdStopwatchActive = false; // Stop stopwatch if active
+    lcdFollowDistance = false; // Stop live distance if active
     lcdClockActive = true;
     
-    // Parse time components
-    int firstColon = value.indexOf(':');
-    int secondColon = value.indexOf(':', firstColon + 1);
-    int thirdColon = value.indexOf(':', secondColon + 1);
-    int fourthColon = value.indexOf(':', thirdColon + 1);
-    
-    lcdClockHours = value.substring(0, firstColon).toInt();
-    lcdClockMinutes = value.substring(firstColon + 1, secondColon).toInt();
-    lcdClockSeconds = value.substring(secondColon + 1, thirdColon).toInt();
-    lcdClockDate = value.substring(thirdColon + 1, fourthColon);
-    lcdClockDay = value.substring(fourthColon + 1);
-    
-    lastLcdClockUpdate = millis();
+    lastLcdClockUpdate = 0; // Draw immediately
     lcd.clear();
-    Serial.println("OK:LCD:CLOCK:START");
+    ack("LCD:CLOCK:START");
+  } else if (action == "FOLLOW") {
+    // Format: FOLLOW:DISTANCE or FOLLOW:OFF
+    if (value == "DISTANCE") {
+      lcdClockActive = false; // Stop clock if active
+      lcdStopwatchActive = false; // Stop stopwatch if active
+      lcdFollowDistance = true;
+      ack("LCD:FOLLOW:DISTANCE");
+    } else if (value == "OFF") {
+      lcdFollowDistance = false;
+      ack("LCD:FOLLOW:OFF");
+    }
   } else if (action == "STOPWATCH") {
     if (value == "START") {
       lcdClockActive = false; // Stop clock if active
+      lcdFollowDistance = false; // Stop live distance if active
       lcdStopwatchActive = true;
       lcdStopwatchStartTime = millis();
       lastLcdStopwatchUpdate = 0;
       lcd.clear();
-      Serial.println("OK:LCD:STOPWATCH:START");
+      ack("LCD:STOPWATCH:START");
     } else if (value == "STOP") {
       lcdStopwatchActive = false;
       lcd.clear();
-      Serial.println("OK:LCD:STOPWATCH:STOP");
+      ack("LCD:STOPWATCH:STOP");
     }
   }
 }
@@ -517,32 +650,25 @@ void handleTM1637(String action, String value) {
     } else {
       tm1637.showNumberDec(number, true);
     }
-    Serial.println("OK:TM1637:NUM");
+    ack("TM1637:NUM");
   } else if (action == "CLEAR") {
     tm1637ClockActive = false; // Stop clock if active
     tm1637CountdownActive = false; // Stop countdown if active
     tm1637.clear();
-    Serial.println("OK:TM1637:CLEAR");
+    ack("TM1637:CLEAR");
   } else if (action == "BRIGHTNESS") {
     int brightness = value.toInt();
     brightness = constrain(brightness, 0, 15);
     tm1637.setBrightness(brightness);
-    Serial.print("OK:TM1637:BRIGHTNESS:");
-    Serial.println(brightness);
+    ack("TM1637:BRIGHTNESS:", brightness);
   } else if (action == "CLOCK") {
-    // Format: CLOCK:HH:MM
-    // Example: CLOCK:14:30
+    // Renders the wall clock set by SYNC:EPOCH (send that first)
     tm1637CountdownActive = false; // Stop countdown if active
     tm1637StopwatchActive = false; // Stop stopwatch if active
     tm1637ClockActive = true;
     
-    int colonPos = value.indexOf(':');
-    tm1637ClockHours = value.substring(0, colonPos).toInt();
-    tm1637ClockMinutes = value.substring(colonPos + 1).toInt();
-    tm1637ClockSeconds = 0;
-    
-    lastTm1637ClockUpdate = millis();
-    Serial.println("OK:TM1637:CLOCK:START");
+    lastTm1637ClockUpdate = 0; // Draw immediately
+    ack("TM1637:CLOCK:START");
   } else if (action == "STOPWATCH") {
     if (value == "START") {
       tm1637CountdownActive = false; // Stop countdown if active
@@ -550,11 +676,11 @@ void handleTM1637(String action, String value) {
       tm1637StopwatchActive = true;
       tm1637StopwatchStartTime = millis();
       lastTm1637StopwatchUpdate = 0;
-      Serial.println("OK:TM1637:STOPWATCH:START");
+      ack("TM1637:STOPWATCH:START");
     } else if (value == "STOP") {
       tm1637StopwatchActive = false;
       tm1637.clear();
-      Serial.println("OK:TM1637:STOPWATCH:STOP");
+      ack("TM1637:STOPWATCH:STOP");
     }
   } else if (action == "COUNTDOWN") {
     // Format: COUNTDOWN:seconds
@@ -576,23 +702,137 @@ void handleTM1637(String action, String value) {
     data[3] = tm1637.encodeDigit(timeStr[3] - '0');
     tm1637.setSegments(data);
     
-    Serial.print("OK:TM1637:COUNTDOWN:");
-    Serial.println(countdownSeconds);
+    ack("TM1637:COUNTDOWN:", countdownSeconds);
+  }
+}
+
+void handleSync(String action, String value) {
+  if (action == "EPOCH") {
+    // Format: EPOCH:<unix_seconds>:<utc_offset_minutes>
+    int colonPos = value.indexOf(':');
+    String secondsStr = colonPos == -1 ? value : value.substring(0, colonPos);
+    long offsetMinutes = colonPos == -1 ? 0 : value.substring(colonPos + 1).toInt();
+    
+    clockEpoch = strtoul(secondsStr.c_str(), NULL, 10) + offsetMinutes * 60L;
+    clockSyncMillis = millis();
+    ack("SYNC:EPOCH");
+  }
+}
+
+void handleProto(String action) {
+  if (action == "BINARY" && ENABLE_BINARY_PROTOCOL) {
+    binaryStatus = true;
+    ack("PROTO:BINARY");
+  } else if (action == "ASCII") {
+    binaryStatus = false;
+    ack("PROTO:ASCII");
+  } else {
+    Serial.println("ERROR:Unsupported protocol");
+  }
+}
+
+void handleProximity(String action, String value) {
+  if (action == "AUTO") {
+    // Format: AUTO:<critical_cm>:<warn_cm>
+    int colonPos = value.indexOf(':');
+    if (colonPos != -1) {
+      proxCriticalCm = value.substring(0, colonPos).toFloat();
+      proxWarnCm = value.substring(colonPos + 1).toFloat();
+    }
+    proxActive = true;
+    proxState = PROX_OFF;
+    ack("PROX:AUTO");
+    
+    // Check right away so the host gets the current state as the next message
+    lastProxCheck = millis();
+    updateProximity(getUltrasonicDistance());
+  } else if (action == "OFF") {
+    stopProximity();
+    ack("PROX:OFF");
+  }
+}
+
+void stopProximity() {
+  if (!proxActive) {
+    return;
+  }
+  proxActive = false;
+  proxState = PROX_OFF;
+  reportAlert(-1);
+}
+
+void updateProximity(float distance) {
+  if (distance < 0) {
+    return; // No echo - keep the current state
+  }
+  
+  // Entering a closer state is immediate; leaving it needs the hysteresis margin
+  uint8_t state;
+  if (distance < proxCriticalCm ||
+      (proxState == PROX_CRITICAL && distance < proxCriticalCm + proxHysteresisCm)) {
+    state = PROX_CRITICAL;
+  } else if (distance < proxWarnCm ||
+             (proxState == PROX_WARN && distance < proxWarnCm + proxHysteresisCm)) {
+    state = PROX_WARN;
+  } else {
+    state = PROX_CLEAR;
+  }
+  if (state == proxState) {
+    return;
+  }
+  proxState = state;
+  
+  char line2[17];
+  buzzerPatternBeepsLeft = 0; // The alarm owns the buzzer now
+  if (state == PROX_CRITICAL) {
+    digitalWrite(BUZZER_PIN, HIGH);
+    buzzerState = true;
+    buzzerStopTime = 0;
+    ledBlinking = true;
+    ledBlinkInterval = 100;
+    lastLedBlink = millis();
+    showLcdLines("WARNING!", "Too Close!");
+  } else {
+    digitalWrite(BUZZER_PIN, LOW);
+    buzzerState = false;
+    buzzerStopTime = 0;
+    ledBlinking = false;
+    ledState = (state == PROX_WARN);
+    digitalWrite(LED_PIN, ledState ? HIGH : LOW);
+    dtostrf(distance, 1, 1, line2);
+    strcat(line2, " cm");
+    showLcdLines(state == PROX_WARN ? "Caution" : "Clear", line2);
   }
+  reportAlert(distance);
+}
+
+// Replace both LCD lines, stopping anything that redraws the LCD on its own
+void showLcdLines(const char* line1, const char* line2) {
+  lcdClockActive = false;
+  lcdStopwatchActive = false;
+  lcdFollowDistance = false;
+  lcd.clear();
+  lcd.setCursor(0, 0);
+  lcd.print(line1);
+  lcd.setCursor(0, 1);
+  lcd.print(line2);
 }
 
-void handleUltrasonic(String action) {
+void handleUltrasonic(String action, String value) {
   if (action == "START") {
     ultrasonicActive = true;
     lastUltrasonicRead = 0;
-    Serial.println("OK:ULTRA:START");
+    ack("ULTRA:START");
   } else if (action == "STOP") {
     ultrasonicActive = false;
-    Serial.println("OK:ULTRA:STOP");
+    stopProximity(); // The alarm needs the sensor too
+    ack("ULTRA:STOP");
   } else if (action == "READ") {
-    float distance = getUltrasonicDistance();
-    Serial.print("ULTRA:");
-    Serial.println(distance);
+    if (value.length() > 0) {
+      reportReading(value.toInt(), getUltrasonicDistance());
+    } else {
+      reportDistance(OP_ULTRA, "ULTRA:", getUltrasonicDistance());
+    }
   }
 }
 
@@ -622,3 +862,184 @@ void sendStatus() {
   Serial.println(ultrasonicActive ? "ACTIVE" : "INACTIVE");
   Serial.println("STATUS:END");
 }
+
+// ---- Binary framing ----
+
+// CRC-8, polynomial 0x07 (bitwise - no table to keep it out of RAM)
+uint8_t crc8(uint8_t crc, const uint8_t* data, uint8_t len) {
+  for (uint8_t i = 0; i < len; i++) {
+    crc ^= data[i];
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x07) : (uint8_t)(crc << 1);
+    }
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t op, const uint8_t* payload, uint8_t len) {
+  uint8_t header[3] = {FRAME_START, op, len};
+  uint8_t crc = crc8(crc8(0, &header[1], 2), payload, len);
+  Serial.write(header, 3);
+  Serial.write(payload, len);
+  Serial.write(crc);
+}
+
+void readFrame() {
+  uint8_t header[3];                         // start, op, len
+  uint8_t payload[FRAME_MAX_PAYLOAD + 1];    // payload + crc
+  if (Serial.readBytes(header, 3) != 3 || header[2] > FRAME_MAX_PAYLOAD) {
+    Serial.println("ERROR:Bad frame");
+    return;
+  }
+  
+  uint8_t len = header[2];
+  if (Serial.readBytes(payload, len + 1) != (size_t)(len + 1) ||
+      crc8(crc8(0, &header[1], 2), payload, len) != payload[len]) {
+    Serial.println("ERROR:Bad frame");
+    return;
+  }
+  
+  currentFrameOp = header[1];
+  handleFrame(header[1], payload, len);
+  currentFrameOp = 0;
+}
+
+// Decode a frame into the matching text-command handler
+void handleFrame(uint8_t op, const uint8_t* payload, uint8_t len) {
+  uint16_t arg = len >= 2 ? payload[0] | (payload[1] << 8) : (len == 1 ? payload[0] : 0);
+  char text[FRAME_MAX_PAYLOAD + 1];
+  
+  switch (op) {
+    case OP_LED_ON:     handleLED("ON", ""); break;
+    case OP_LED_OFF:    handleLED("OFF", ""); break;
+    case OP_LED_BLINK:  handleLED("BLINK", String(arg)); break;
+    case OP_LED_TOGGLE: handleLED("TOGGLE", ""); break;
+    case OP_BUZZER_ON:   handleBuzzer("ON", ""); break;
+    case OP_BUZZER_OFF:  handleBuzzer("OFF", ""); break;
+    case OP_BUZZER_BEEP: handleBuzzer("BEEP", String(arg)); break;
+    case OP_LCD_LINE1:
+    case OP_LCD_LINE2:
+      memcpy(text, payload, len);
+      text[len] = '\0';
+      handleLCD(op == OP_LCD_LINE1 ? "LINE1" : "LINE2", String(text));
+      break;
+    case OP_LCD_CLEAR:         handleLCD("CLEAR", ""); break;
+    case OP_TM1637_NUM:        handleTM1637("NUM", String((int16_t)arg)); break;
+    case OP_TM1637_CLEAR:      handleTM1637("CLEAR", ""); break;
+    case OP_TM1637_BRIGHTNESS: handleTM1637("BRIGHTNESS", String(arg)); break;
+    case OP_TM1637_COUNTDOWN:  handleTM1637("COUNTDOWN", String(arg)); break;
+    case OP_TM1637_DIGITS:
+      // BCD pairs -> the 4-digit text form, which NUM draws with the colon
+      sprintf(text, "%02x%02x", arg & 0xFF, arg >> 8);
+      handleTM1637("NUM", String(text));
+      break;
+    case OP_ULTRA_START: handleUltrasonic("START", ""); break;
+    case OP_ULTRA_STOP:  handleUltrasonic("STOP", ""); break;
+    case OP_ULTRA_READ:  handleUltrasonic("READ", len ? String(arg) : ""); break;
+    default:
+      Serial.println("ERROR:Unknown opcode");
+  }
+}
+
+// Acknowledge a command: ACK frame for a binary command, "OK:<what>" line otherwise
+void ack(const char* what) {
+  if (currentFrameOp != 0) {
+    sendFrame(OP_ACK, &currentFrameOp, 1);
+    return;
+  }
+  Serial.print("OK:");
+  Serial.println(what);
+}
+
+void ack(const char* what, long value) {
+  if (currentFrameOp != 0) {
+    sendFrame(OP_ACK, &currentFrameOp, 1);
+    return;
+  }
+  Serial.print("OK:");
+  Serial.print(what);
+  Serial.println(value);
+}
+
+void ack(const char* what, const char* value) {
+  if (currentFrameOp != 0) {
+    sendFrame(OP_ACK, &currentFrameOp, 1);
+    return;
+  }
+  Serial.print("OK:");
+  Serial.print(what);
+  Serial.println(value);
+}
+
+// ---- Status reports (text lines, or frames after PROTO:BINARY) ----
+
+void reportTimerRemaining(int seconds) {
+  if (binaryStatus) {
+    uint8_t payload[2] = {(uint8_t)(seconds & 0xFF), (uint8_t)(seconds >> 8)};
+    sendFrame(OP_TIMER_REMAINING, payload, 2);
+    return;
+  }
+  Serial.print("TIMER:REMAINING:");
+  Serial.println(seconds);
+}
+
+void reportCountdownFinished() {
+  if (binaryStatus) {
+    sendFrame(OP_COUNTDOWN_FINISHED, NULL, 0);
+    return;
+  }
+  Serial.println("COUNTDOWN:FINISHED");
+}
+
+void reportClock() {
+  if (binaryStatus) {
+    uint8_t payload[3] = {(uint8_t)lcdClockHours, (uint8_t)lcdClockMinutes, (uint8_t)lcdClockSeconds};
+    sendFrame(OP_CLOCK, payload, 3);
+    return;
+  }
+  char timeStr[9];
+  sprintf(timeStr, "%02d:%02d:%02d", lcdClockHours, lcdClockMinutes, lcdClockSeconds);
+  Serial.print("CLOCK:LCD:");
+  Serial.println(timeStr);
+}
+
+void reportAlert(float distance) {
+  if (binaryStatus) {
+    uint16_t raw = distance < 0 ? 0xFFFF : (uint16_t)(distance * 100 + 0.5);
+    uint8_t payload[3] = {proxState, (uint8_t)(raw & 0xFF), (uint8_t)(raw >> 8)};
+    sendFrame(OP_ALERT, payload, 3);
+    return;
+  }
+  Serial.print("ALERT:");
+  Serial.print(PROX_STATE_NAMES[proxState]);
+  if (proxState != PROX_OFF) {
+    Serial.print(":");
+    Serial.print(distance);
+  }
+  Serial.println();
+}
+
+void reportDistance(uint8_t op, const char* prefix, float distance) {
+  if (binaryStatus || (op == OP_ULTRA && currentFrameOp != 0)) {
+    uint16_t raw = distance < 0 ? 0xFFFF : (uint16_t)(distance * 100 + 0.5);
+    uint8_t payload[2] = {(uint8_t)(raw & 0xFF), (uint8_t)(raw >> 8)};
+    sendFrame(op, payload, 2);
+    return;
+  }
+  Serial.print(prefix);
+  Serial.println(distance);
+}
+
+// ULTRA:READ:<seq> reply - the sequence number tells it apart from stale readings
+void reportReading(uint8_t seq, float distance) {
+  if (binaryStatus || currentFrameOp != 0) {
+    uint16_t raw = distance < 0 ? 0xFFFF : (uint16_t)(distance * 100 + 0.5);
+    uint8_t payload[3] = {seq, (uint8_t)(raw & 0xFF), (uint8_t)(raw >> 8)};
+    sendFrame(OP_ULTRA, payload, 3);
+    return;
+  }
+  Serial.print("ULTRA:");
+  Serial.print(seq);
+  Serial.print(":");
+  Serial.println(distance);
+}
@@ -6,32 +6,139 @@ This is an async implementation that allows simultaneous control of multiple dev
 """
 
 import asyncio
+import struct
 import serial
+import serial_asyncio
+import os
 import sys
-from datetime import datetime
-import aioconsole
+import time
+from functools import lru_cache
+from typing import Any, Callable
+
+try:
+    import uvloop  # Optional: faster event loop on Linux/macOS
+except ImportError:
+    uvloop = None
 
 # Change COM port to match your Arduino
 COM_PORT = "COM6"
-BAUD_RATE = 9600
+BAUD_RATE = 115200
+
+# Outbound batching: commands queued within BATCH_DELAY go out as one write,
+# up to MAX_BATCH commands / the Arduino's 64-byte serial receive buffer
+MAX_BATCH = 16
+MAX_BATCH_BYTES = 64
+BATCH_DELAY = 0.005
+
+READY_TIMEOUT = 2.5  # Upper bound on the Arduino boot after the open-triggered reset (seconds)
+
+TX_QUEUE_SIZE = 256  # Commands waiting for _tx_pump; clock ticks are dropped beyond this
+
+DISTANCE_PRINT_INTERVAL = 0.2  # Redraw the live distance at most 5 times a second
+
+# Binary frames (same format as the MCP server, see master_control.ino):
+# 0xAA <op> <len> <payload> <crc8>, little-endian integers
+BINARY_MODE = True
+FRAME_START = 0xAA
+OP_LED_ON = 0x01
+OP_LED_OFF = 0x02
+OP_LED_BLINK = 0x03          # u16 interval ms
+OP_LED_TOGGLE = 0x04
+OP_BUZZER_ON = 0x10
+OP_BUZZER_OFF = 0x11
+OP_BUZZER_BEEP = 0x12        # u16 duration ms
+OP_LCD_LINE1 = 0x20          # text
+OP_LCD_LINE2 = 0x21          # text
+OP_LCD_CLEAR = 0x22
+OP_TM1637_NUM = 0x30         # i16
+OP_TM1637_CLEAR = 0x31
+OP_TM1637_BRIGHTNESS = 0x32  # u8
+OP_TM1637_DIGITS = 0x34      # 2 bytes BCD, drawn with the colon
+OP_ULTRA_START = 0x40
+OP_ULTRA_STOP = 0x41
+OP_ULTRA_READ = 0x42
+OP_ACK = 0x80                # u8 opcode acknowledged
+OP_ULTRA = 0x85              # [u8 seq] u16 cm*100 (0xFFFF = no echo)
+_U16 = struct.Struct('<H')
+
+def crc8(data):
+    """CRC-8, polynomial 0x07, initial value 0"""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+# Most commands repeat (LED:ON, the same beep, the clock digits) - encode each once
+@lru_cache(maxsize=64)
+def encode_frame(op, payload=b""):
+    """Build a binary frame: 0xAA <op> <len> <payload> <crc8>"""
+    body = bytes((op, len(payload))) + payload
+    return bytes((FRAME_START,)) + body + bytes((crc8(body),))
+
+@lru_cache(maxsize=64)
+def encode_line(command):
+    """Text command -> the newline-terminated bytes sent for it"""
+    return f"{command}\n".encode()
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")  # time.struct_time.tm_wday
+
+def _until_next_second():
+    """Seconds left until the wall clock ticks over, so clock updates land on the second"""
+    return 1 - time.time() % 1
+
+async def _stopped_within(stop, timeout):
+    """Wait up to timeout seconds for the stop Event; True if it was set"""
+    try:
+        await asyncio.wait_for(stop.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+def _u16(value):
+    """value as 2 little-endian bytes (None if it doesn't fit - sent as text instead)"""
+    return value.to_bytes(2, 'little') if 0 <= value <= 0xFFFF else None
 
 class ArduinoController:
-    def __init__(self, port, baudrate):
+    def __init__(self, port, baudrate, binary_mode=BINARY_MODE):
         self.port = port
         self.baudrate = baudrate
-        self.arduino = None
+        self.binary_mode = binary_mode  # Send frames where the command has an opcode
+        self.reader = None  # asyncio StreamReader/StreamWriter over the serial port
+        self.writer = None
+        self._tx_queue = asyncio.Queue(maxsize=TX_QUEUE_SIZE)  # Encoded commands for _tx_pump (None = stop)
+        self._ticks = {}  # Display slot -> its clock tick still in _tx_queue, as [payload, slot]
+        self._dropped_ticks = 0
+        self._last_drop_report = 0.0
+        self._tx_task = None
+        self._tx_buf = bytearray()  # One buffer for the whole _tx_pump loop, cleared per batch
+        self._reader_task = None
+        self._flush_requested = asyncio.Event()  # Set by flush(): skip the batch delay
         self.running = False
         self.ultrasonic_active = False
-        self.clock_active = False
-        self.timer_active = False
+        self._last_distance_print = 0.0  # time.monotonic() of the last redraw
+        self._pending_distance = 0.0  # Newest reading, drawn by _draw_distance
+        self._distance_redraw = None  # TimerHandle while a skipped reading waits for its redraw
         self.timer_seconds = 0
-        self.lcd_clock_active = False
+        # Set to end the display_clock / display_countdown / lcd_clock loop
+        # (each start makes a fresh Event, so a restart can't revive a stopped loop,
+        # and a stop() right after a start still reaches the new loop)
+        self._clock_stop = asyncio.Event()
+        self._timer_stop = asyncio.Event()
+        self._lcd_clock_stop = asyncio.Event()
         
     async def connect(self):
         """Establish connection to Arduino"""
         try:
-            self.arduino = serial.Serial(self.port, self.baudrate, timeout=0.1)
-            await asyncio.sleep(2)  # Wait for Arduino reset
+            self.reader, self.writer = await serial_asyncio.open_serial_connection(
+                url=self.port, baudrate=self.baudrate)
+            self._enable_low_latency(self.writer.transport.serial)
+            self._tx_task = asyncio.create_task(self._tx_pump())
+            await self._wait_for_ready()
+            if self.binary_mode:
+                # Readings streamed by ULTRA:START as 6-byte frames too
+                await self.send_command("PROTO:BINARY")
             print(f"✓ Connected to Arduino on {self.port}")
             return True
         except serial.SerialException as e:
@@ -39,207 +146,412 @@ class ArduinoController:
             print(f"  Details: {e}")
             return False
     
-    def send_command(self, command):
-        """Send command to Arduino"""
-        if self.arduino:
-            try:
-                self.arduino.write(f"{command}\n".encode())
+    async def _wait_for_ready(self):
+        """Wait for the sketch's READY banner after the open-triggered auto-reset"""
+        try:
+            await asyncio.wait_for(self.reader.readuntil(b"READY\r\n"), READY_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass  # No banner (older sketch, or no reset on open) - carry on, as after the fixed wait
+    
+    def _enable_low_latency(self, port):
+        """Have the driver hand received bytes over at once (Linux; skipped elsewhere)"""
+        try:
+            port.set_low_latency_mode(True)  # pyserial >= 3.5
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            pass  # Not available on this platform / driver - still works, just slower
+    
+    async def send_command(self, command, tick=None):
+        """Queue command for the Arduino (written by _tx_pump)"""
+        if self.writer:
+            await self._enqueue(encode_line(command), tick)
+            return True
+        return False
+    
+    async def _send(self, command, op=None, payload=b"", tick=None):
+        """Queue command as a binary frame (when it has an opcode and payload), else as text"""
+        if self.binary_mode and op is not None and payload is not None:
+            if self.writer:
+                await self._enqueue(encode_frame(op, payload), tick)
                 return True
+            return False
+        return await self.send_command(command, tick)
+    
+    async def _enqueue(self, payload, tick=None):
+        """Queue payload for _tx_pump, waiting while the queue is full
+
+        A clock tick (tick = the display slot it redraws) never waits: it
+        replaces the slot's tick if that is still queued - only the newest
+        time matters - and is dropped when the queue is full.
+        """
+        if tick is None:
+            await self._tx_queue.put(payload)
+            return
+        queued = self._ticks.get(tick)
+        if queued is not None:
+            queued[0] = payload
+            return
+        if self._tx_queue.full():
+            self._dropped_ticks += 1
+            now = time.monotonic()
+            if now - self._last_drop_report >= 1:
+                print(f"\n✗ Serial falling behind - dropped {self._dropped_ticks} clock update(s)")
+                self._dropped_ticks = 0
+                self._last_drop_report = now
+            return
+        queued = self._ticks[tick] = [payload, tick]
+        self._tx_queue.put_nowait(queued)
+    
+    def _unwrap(self, item):
+        """Queue item -> payload (a clock tick leaves its slot, so the next one queues anew)"""
+        if isinstance(item, list):
+            del self._ticks[item[1]]
+            return item[0]
+        return item
+    
+    async def _tx_pump(self):
+        """Write queued commands in order, a burst at a time; only this task waits for the port to drain"""
+        payload = self._unwrap(await self._tx_queue.get())
+        while payload is not None:
+            # Give the rest of this tick's commands a moment to show up
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), BATCH_DELAY)
+            except asyncio.TimeoutError:
+                pass
+            
+            buf = self._tx_buf
+            buf.clear()
+            buf += payload
+            count = 1
+            payload = ...  # Nothing carried over into the next batch
+            while count < MAX_BATCH and not self._tx_queue.empty():
+                queued = self._unwrap(self._tx_queue.get_nowait())
+                if queued is None or len(buf) + len(queued) > MAX_BATCH_BYTES:
+                    payload = queued  # Stop, or start the next batch with it
+                    break
+                buf += queued
+                count += 1
+            
+            try:
+                # The transport may hold on to what it can't write yet, and buf is
+                # refilled for the next batch - so it gets one bytes() snapshot
+                self.writer.write(bytes(buf))
+                await self.writer.drain()
             except Exception as e:
                 print(f"✗ Error sending command: {e}")
-                return False
-        return False
+            for _ in range(count):
+                self._tx_queue.task_done()
+            
+            if payload is ...:
+                payload = self._unwrap(await self._tx_queue.get())
+        self._tx_queue.task_done()  # The None sentinel
+    
+    async def flush(self):
+        """Write everything queued now instead of after the batch delay"""
+        self._flush_requested.set()
+        await self._tx_queue.join()
+        self._flush_requested.clear()
+    
+    def start_reading(self):
+        """Start the read_responses task (cancelled by close())"""
+        self._reader_task = asyncio.create_task(self.read_responses())
     
     async def read_responses(self):
         """Continuously read responses from Arduino"""
         while self.running:
             try:
-                if self.arduino and self.arduino.in_waiting > 0:
-                    line = self.arduino.readline().decode('utf-8').strip()
-                    if line:
-                        await self.handle_response(line)
+                # Wakes only when a whole line (or frame) has arrived
+                first = await self.reader.readexactly(1)
+                if first[0] == FRAME_START:
+                    await self.read_frame()
+                    continue
+                line = (first + await self.reader.readuntil(b"\n")).decode('utf-8').strip()
+                if line:
+                    await self.handle_response(line)
+            except asyncio.IncompleteReadError:
+                # EOF - the port went away (unplugged, or closed under us)
+                if self.running:
+                    print("\n✗ Serial connection lost")
+                    self.running = False
+                break
             except Exception as e:
                 print(f"✗ Error reading response: {e}")
-            await asyncio.sleep(0.01)
     
-    async def handle_response(self, response):
+    async def read_frame(self) -> None:
+        """Read the rest of a binary frame (0xAA already consumed) and handle it"""
+        header = await self.reader.readexactly(2)
+        body = header + await self.reader.readexactly(header[1] + 1)
+        if crc8(body[:-1]) != body[-1]:
+            return  # Corrupt frame - drop it
+        op, payload = body[0], body[2:-1]
+        if op == OP_ULTRA:
+            (raw,) = _U16.unpack_from(payload, len(payload) - 2)  # After the seq byte, if any
+            self.show_distance(-1.0 if raw == 0xFFFF else raw * 0.01)
+        # OP_ACK: acknowledgment - nothing to show
+    
+    def show_distance(self, distance: float) -> None:
+        """Print an ultrasonic reading in place, at most once per DISTANCE_PRINT_INTERVAL
+
+        A reading that arrives sooner is drawn when the interval is up (newer
+        ones replace it), so the last reading of a burst is always shown.
+        """
+        if distance <= 0:
+            return
+        self._pending_distance = distance
+        if self._distance_redraw is not None:
+            return  # Already waiting to draw
+        wait = self._last_distance_print + DISTANCE_PRINT_INTERVAL - time.monotonic()
+        if wait > 0:
+            self._distance_redraw = asyncio.get_running_loop().call_later(wait, self._draw_distance)
+        else:
+            self._draw_distance()
+    
+    def _draw_distance(self) -> None:
+        self._distance_redraw = None
+        self._last_distance_print = time.monotonic()
+        sys.stdout.write("  📏 Distance: %.2f cm      \r" % self._pending_distance)
+        sys.stdout.flush()
+    
+    async def handle_response(self, response: str) -> None:
         """Handle responses from Arduino"""
-        if response.startswith("OK:"):
-            # Acknowledgment - optionally log
+        tag, _, rest = response.partition(":")
+        handler = _RESP_TABLE.get(tag)
+        if handler:
+            handler(self, rest)
+    
+    def _on_ok(self, rest: str) -> None:
+        pass  # Acknowledgment - optionally log
+    
+    def _on_ultra(self, rest: str) -> None:
+        """Ultrasonic reading"""
+        try:
+            self.show_distance(float(rest))
+        except ValueError:
             pass
-        elif response.startswith("ULTRA:"):
-            # Ultrasonic reading
-            try:
-                distance = float(response.split(':')[1])
-                if distance > 0:
-                    print(f"  📏 Distance: {distance:.2f} cm      ", end='\r')
-            except:
-                pass
-        elif response.startswith("ERROR:"):
-            print(f"\n✗ {response}")
-        elif response.startswith("STATUS:"):
-            print(f"  {response}")
+    
+    def _on_error(self, rest: str) -> None:
+        print(f"\n✗ ERROR:{rest}")
+    
+    def _on_status(self, rest: str) -> None:
+        print(f"  STATUS:{rest}")
+    
+    async def send_line(self, line, text, tick=False):
+        """LCD:LINE1/LINE2 (frames carry at most the 16 characters the LCD shows)
+
+        tick=True marks a clock update that a newer one may replace or drop.
+        """
+        try:
+            payload = text[:16].encode('ascii')
+        except UnicodeEncodeError:
+            payload = None
+        await self._send(f"LCD:LINE{line}:{text}", OP_LCD_LINE1 if line == 1 else OP_LCD_LINE2, payload,
+                         f"LCD:LINE{line}" if tick else None)
+    
+    async def send_number(self, value, tick=False):
+        """TM1637:NUM - four digits ("0130") are drawn with the colon, as in the text protocol
+
+        tick=True marks a clock / countdown update that a newer one may replace or drop.
+        """
+        value = str(value)
+        slot = "TM1637:NUM" if tick else None
+        if len(value) == 4 and value.isascii() and value.isdigit():
+            await self._send(f"TM1637:NUM:{value}", OP_TM1637_DIGITS, bytes.fromhex(value), slot)
+        elif len(value) != 4 and -0x8000 <= int(value) <= 0x7FFF:
+            await self._send(f"TM1637:NUM:{value}", OP_TM1637_NUM, int(value).to_bytes(2, 'little', signed=True), slot)
+        else:
+            await self.send_command(f"TM1637:NUM:{value}", slot)
     
     # Device Control Methods
     
-    def led_on(self):
+    async def led_on(self):
         """Turn LED on"""
-        self.send_command("LED:ON")
+        await self._send("LED:ON", OP_LED_ON)
         print("✓ LED: ON")
     
-    def led_off(self):
+    async def led_off(self):
         """Turn LED off"""
-        self.send_command("LED:OFF")
+        await self._send("LED:OFF", OP_LED_OFF)
         print("✓ LED: OFF")
     
-    def led_blink(self, interval=500):
+    async def led_blink(self, interval=500):
         """Blink LED with specified interval (ms)"""
-        self.send_command(f"LED:BLINK:{interval}")
+        await self._send(f"LED:BLINK:{interval}", OP_LED_BLINK, _u16(interval))
         print(f"✓ LED: Blinking at {interval}ms interval")
     
-    def led_toggle(self):
+    async def led_toggle(self):
         """Toggle LED state"""
-        self.send_command("LED:TOGGLE")
+        await self._send("LED:TOGGLE", OP_LED_TOGGLE)
         print("✓ LED: Toggled")
     
-    def buzzer_on(self):
+    async def buzzer_on(self):
         """Turn buzzer on"""
-        self.send_command("BUZZER:ON")
+        await self._send("BUZZER:ON", OP_BUZZER_ON)
         print("✓ Buzzer: ON")
     
-    def buzzer_off(self):
+    async def buzzer_off(self):
         """Turn buzzer off"""
-        self.send_command("BUZZER:OFF")
+        await self._send("BUZZER:OFF", OP_BUZZER_OFF)
         print("✓ Buzzer: OFF")
     
-    def buzzer_beep(self, duration=100):
+    async def buzzer_beep(self, duration=100):
         """Beep buzzer for specified duration (ms)"""
-        self.send_command(f"BUZZER:BEEP:{duration}")
+        await self._send(f"BUZZER:BEEP:{duration}", OP_BUZZER_BEEP, _u16(duration))
         print(f"✓ Buzzer: Beep for {duration}ms")
     
-    def lcd_write(self, line, text):
+    async def buzzer_pattern(self, count, on_ms, off_ms):
+        """Beep count times (on_ms on, off_ms off) - timed by the Arduino, one command"""
+        await self.send_command(f"BUZZER:PATTERN:{on_ms},{off_ms},{count}")
+    
+    async def lcd_write(self, line, text):
         """Write text to LCD line (1 or 2)"""
-        self.send_command(f"LCD:LINE{line}:{text}")
+        await self.send_line(line, text)
         print(f"✓ LCD Line {line}: {text}")
     
-    def lcd_clear(self):
+    async def lcd_clear(self):
         """Clear LCD display"""
-        self.send_command("LCD:CLEAR")
+        await self._send("LCD:CLEAR", OP_LCD_CLEAR)
         print("✓ LCD: Cleared")
     
-    def lcd_backlight(self, state):
+    async def lcd_backlight(self, state):
         """Control LCD backlight (ON/OFF)"""
-        self.send_command(f"LCD:BACKLIGHT:{state}")
+        await self.send_command(f"LCD:BACKLIGHT:{state}")
         print(f"✓ LCD Backlight: {state}")
     
-    def display_number(self, number):
+    async def display_number(self, number):
         """Display number on TM1637"""
-        self.send_command(f"TM1637:NUM:{number}")
+        await self.send_number(number)
         print(f"✓ Display: {number}")
     
-    def display_clear(self):
+    async def display_clear(self):
         """Clear TM1637 display"""
-        self.send_command("TM1637:CLEAR")
+        await self._send("TM1637:CLEAR", OP_TM1637_CLEAR)
         print("✓ Display: Cleared")
     
-    def display_brightness(self, level):
+    async def display_brightness(self, level):
         """Set display brightness (0-15)"""
         level = max(0, min(15, level))
-        self.send_command(f"TM1637:BRIGHTNESS:{level}")
+        await self._send(f"TM1637:BRIGHTNESS:{level}", OP_TM1637_BRIGHTNESS, bytes((level,)))
         print(f"✓ Display Brightness: {level}")
     
-    def ultrasonic_start(self):
+    async def ultrasonic_start(self):
         """Start continuous ultrasonic readings"""
-        self.send_command("ULTRA:START")
+        await self._send("ULTRA:START", OP_ULTRA_START)
         self.ultrasonic_active = True
         print("✓ Ultrasonic: Started")
     
-    def ultrasonic_stop(self):
+    async def ultrasonic_stop(self):
         """Stop ultrasonic readings"""
-        self.send_command("ULTRA:STOP")
+        await self._send("ULTRA:STOP", OP_ULTRA_STOP)
         self.ultrasonic_active = False
         print("✓ Ultrasonic: Stopped")
     
-    def ultrasonic_read(self):
+    async def ultrasonic_read(self):
         """Get single ultrasonic reading"""
-        self.send_command("ULTRA:READ")
+        await self._send("ULTRA:READ", OP_ULTRA_READ)
+        await self.flush()
     
-    def get_status(self):
+    async def get_status(self):
         """Get status of all devices"""
-        self.send_command("STATUS")
+        await self.send_command("STATUS")
     
     # High-level Functions
     
-    async def display_clock(self):
-        """Display current time on TM1637"""
-        self.clock_active = True
+    def display_clock(self):
+        """Start displaying the current time on TM1637 (returns the loop's task)"""
+        self._clock_stop.set()  # One clock loop at a time
+        self._clock_stop = asyncio.Event()
+        return asyncio.create_task(self._clock_loop(self._clock_stop))
+    
+    async def _clock_loop(self, stop):
         print("✓ Clock: Started on TM1637")
-        while self.clock_active and self.running:
-            now = datetime.now()
-            time_str = now.strftime("%H%M")
-            self.send_command(f"TM1637:NUM:{time_str}")
-            await asyncio.sleep(1)
-    
-    async def display_countdown(self, minutes, seconds):
-        """Display countdown timer on TM1637"""
-        self.timer_active = True
+        while self.running:
+            now = time.localtime()
+            await self.send_number("%02d%02d" % (now.tm_hour, now.tm_min), tick=True)
+            if await _stopped_within(stop, _until_next_second()):
+                break
+    
+    def display_countdown(self, minutes, seconds):
+        """Start a countdown timer on TM1637 (returns the loop's task)"""
+        self._timer_stop.set()
+        self._timer_stop = asyncio.Event()
+        return asyncio.create_task(self._countdown_loop(minutes, seconds, self._timer_stop))
+    
+    async def _countdown_loop(self, minutes, seconds, stop):
         total_seconds = minutes * 60 + seconds
         print(f"✓ Timer: Started {minutes:02d}:{seconds:02d}")
         
-        while total_seconds >= 0 and self.timer_active and self.running:
+        while total_seconds >= 0 and self.running:
             mins = total_seconds // 60
             secs = total_seconds % 60
             time_str = f"{mins:02d}{secs:02d}"
-            self.send_command(f"TM1637:NUM:{time_str}")
+            await self.send_number(time_str, tick=True)
             
             if total_seconds == 0:
                 print("\n✓ Timer: Finished!")
-                # Beep 3 times
-                for _ in range(3):
-                    self.buzzer_beep(300)
-                    await asyncio.sleep(0.5)
+                await self.buzzer_pattern(3, 300, 200)  # Beep 3 times, every 0.5 s
                 break
             
             total_seconds -= 1
-            await asyncio.sleep(1)
-        
-        self.timer_active = False
+            if await _stopped_within(stop, 1):
+                break
+    
+    def lcd_clock(self):
+        """Start displaying date and time on LCD (returns the loop's task)"""
+        self._lcd_clock_stop.set()
+        self._lcd_clock_stop = asyncio.Event()
+        return asyncio.create_task(self._lcd_clock_loop(self._lcd_clock_stop))
     
-    async def lcd_clock(self):
-        """Display date and time on LCD"""
-        self.lcd_clock_active = True
+    async def _lcd_clock_loop(self, stop):
         print("✓ LCD Clock: Started")
-        while self.running and self.lcd_clock_active:
-            now = datetime.now()
-            time_str = now.strftime("%H:%M:%S")
-            date_str = now.strftime("%d/%m/%Y %a")
-            self.send_command(f"LCD:LINE1:{time_str}")
-            self.send_command(f"LCD:LINE2:{date_str}")
-            await asyncio.sleep(1)
-        self.lcd_clock_active = False
+        while self.running:
+            now = time.localtime()
+            await self.send_line(1, "%02d:%02d:%02d" % (now.tm_hour, now.tm_min, now.tm_sec), tick=True)
+            await self.send_line(2, "%02d/%02d/%04d %s" % (
+                now.tm_mday, now.tm_mon, now.tm_year, _WEEKDAYS[now.tm_wday]), tick=True)
+            if await _stopped_within(stop, _until_next_second()):
+                break
     
     def stop_clock(self):
         """Stop clock display"""
-        self.clock_active = False
+        self._clock_stop.set()
         print("✓ Clock: Stopped")
     
     def stop_timer(self):
         """Stop countdown timer"""
-        self.timer_active = False
+        self._timer_stop.set()
         print("✓ Timer: Stopped")
     
     def stop_lcd_clock(self):
         """Stop LCD clock display"""
-        self.lcd_clock_active = False
+        self._lcd_clock_stop.set()
         print("✓ LCD Clock: Stopped")
     
-    def close(self):
-        """Close connection"""
+    async def close(self):
+        """Close connection (after writing whatever is still queued)"""
         self.running = False
-        if self.arduino:
-            self.arduino.close()
+        for stop in (self._clock_stop, self._timer_stop, self._lcd_clock_stop):
+            stop.set()
+        if self._tx_task:
+            await self._tx_queue.put(None)
+            await self._tx_task
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        if self.writer:
+            self.writer.close()
             print("\n✓ Serial connection closed")
 
+# Response tag (text before the first ':') -> handler, called with the rest.
+# Kept outside the class body so it also works when the module is compiled with mypyc.
+_RESP_TABLE: dict[str, Callable[[ArduinoController, str], None]] = {
+    "OK": ArduinoController._on_ok,
+    "ULTRA": ArduinoController._on_ultra,
+    "ERROR": ArduinoController._on_error,
+    "STATUS": ArduinoController._on_status,
+}
+
 async def show_menu():
     """Display command menu"""
     menu = """
@@ -270,115 +582,139 @@ async def show_menu():
 """
     print(menu)
 
-async def process_command(controller, cmd):
-    """Process user commands"""
-    cmd = cmd.strip().lower()
-    parts = cmd.split()
+def _display_clock(c: ArduinoController, p: list[str]) -> None:
+    c.stop_timer()
+    c.display_clock()
+
+def _display_stop(c: ArduinoController, p: list[str]) -> None:
+    c.stop_clock()
+    c.stop_timer()
+
+# (device, subcommand) -> handler(controller, parts); a returned coroutine is awaited
+_CMD_TABLE: dict[tuple[str, str], Callable[[ArduinoController, list[str]], Any]] = {
+    ("led", "on"): lambda c, p: c.led_on(),
+    ("led", "off"): lambda c, p: c.led_off(),
+    ("led", "blink"): lambda c, p: c.led_blink(int(p[2]) if len(p) > 2 else 500),
+    ("led", "toggle"): lambda c, p: c.led_toggle(),
+    ("buzzer", "on"): lambda c, p: c.buzzer_on(),
+    ("buzzer", "off"): lambda c, p: c.buzzer_off(),
+    ("buzzer", "beep"): lambda c, p: c.buzzer_beep(int(p[2]) if len(p) > 2 else 100),
+    ("lcd", "clear"): lambda c, p: c.lcd_clear(),
+    ("lcd", "clock"): lambda c, p: c.lcd_clock(),
+    ("lcd", "stop"): lambda c, p: c.stop_lcd_clock(),
+    ("display", "clear"): lambda c, p: c.display_clear(),
+    ("display", "clock"): _display_clock,
+    ("display", "stop"): _display_stop,
+    ("display", "brightness"): lambda c, p: c.display_brightness(int(p[2]) if len(p) > 2 else 15),
+    ("ultra", "start"): lambda c, p: c.ultrasonic_start(),
+    ("ultra", "stop"): lambda c, p: c.ultrasonic_stop(),
+    ("ultra", "read"): lambda c, p: c.ultrasonic_read(),
+    ("status", ""): lambda c, p: c.get_status(),
+    ("help", ""): lambda c, p: show_menu(),
+}
+
+# Devices that take a subcommand, and what to print when it's missing / unknown
+_USAGE: dict[str, str] = {
+    "led": "led on/off/blink/toggle",
+    "buzzer": "buzzer on/off/beep",
+    "lcd": "lcd 1:<text> / lcd 2:<text> / lcd clear / lcd clock / lcd stop",
+    "display": "display <number>/clear/clock/timer:<MM:SS>/stop/brightness",
+    "ultra": "ultra start/stop/read",
+}
+
+async def _dispatch_argument(controller: ArduinoController, device: str, sub: str, line: str) -> None:
+    """Subcommands that carry their value (lcd 1:<text>, display timer:<MM:SS>, display <number>)"""
+    if device == "lcd" and sub[:2] in ("1:", "2:"):
+        # Text as typed - everything after the first ':' (the device name has none)
+        await controller.lcd_write(int(sub[0]), line[line.index(":") + 1:])
+    elif device == "display" and sub.startswith("timer:"):
+        controller.stop_clock()
+        mins, secs = map(int, sub.split(":", 1)[1].split(":"))
+        controller.display_countdown(mins, secs)
+    elif device == "display":
+        try:
+            number = int(sub)
+        except ValueError:
+            print("✗ Invalid number")
+            return
+        await controller.display_number(number)
+    else:
+        print(f"✗ Usage: {_USAGE[device]}")
+
+async def process_command(controller: ArduinoController, cmd: str) -> bool:
+    """Process user commands (case-insensitive, except for LCD text)"""
+    line = cmd.strip()
+    parts = line.split(maxsplit=2)  # device, subcommand, argument
     
     if not parts:
         return True
     
-    device = parts[0]
+    device = parts[0].lower()
+    sub = parts[1].lower() if len(parts) > 1 else ""
+    if device in ("exit", "quit"):
+        return False
     
     try:
-        # LED Commands
-        if device == "led":
-            if len(parts) < 2:
-                print("✗ Usage: led on/off/blink/toggle")
-            elif parts[1] == "on":
-                controller.led_on()
-            elif parts[1] == "off":
-                controller.led_off()
-            elif parts[1] == "blink":
-                interval = int(parts[2]) if len(parts) > 2 else 500
-                controller.led_blink(interval)
-            elif parts[1] == "toggle":
-                controller.led_toggle()
-        
-        # Buzzer Commands
-        elif device == "buzzer":
-            if len(parts) < 2:
-                print("✗ Usage: buzzer on/off/beep")
-            elif parts[1] == "on":
-                controller.buzzer_on()
-            elif parts[1] == "off":
-                controller.buzzer_off()
-            elif parts[1] == "beep":
-                duration = int(parts[2]) if len(parts) > 2 else 100
-                controller.buzzer_beep(duration)
-        
-        # LCD Commands
-        elif device == "lcd":
+        if device in _USAGE:
             if len(parts) < 2:
-                print("✗ Usage: lcd 1:<text> / lcd 2:<text> / lcd clear / lcd clock / lcd stop")
-            elif parts[1] == "clear":
-                controller.lcd_clear()
-            elif parts[1] == "clock":
-                asyncio.create_task(controller.lcd_clock())
-            elif parts[1] == "stop":
-                controller.stop_lcd_clock()
-                await asyncio.sleep(0.1)  # Give task time to stop
-            elif parts[1].startswith("1:"):
-                text = cmd.split("1:", 1)[1]
-                controller.lcd_write(1, text)
-            elif parts[1].startswith("2:"):
-                text = cmd.split("2:", 1)[1]
-                controller.lcd_write(2, text)
-        
-        # Display Commands
-        elif device == "display":
-            if len(parts) < 2:
-                print("✗ Usage: display <number>/clear/clock/timer:<MM:SS>/stop/brightness")
-            elif parts[1] == "clear":
-                controller.display_clear()
-            elif parts[1] == "clock":
-                controller.stop_timer()
-                asyncio.create_task(controller.display_clock())
-            elif parts[1].startswith("timer:"):
-                controller.stop_clock()
-                time_part = parts[1].split(":", 1)[1]
-                mins, secs = map(int, time_part.split(":"))
-                asyncio.create_task(controller.display_countdown(mins, secs))
-            elif parts[1] == "stop":
-                controller.stop_clock()
-                controller.stop_timer()
-            elif parts[1] == "brightness":
-                level = int(parts[2]) if len(parts) > 2 else 15
-                controller.display_brightness(level)
-            else:
-                try:
-                    number = int(parts[1])
-                    controller.display_number(number)
-                except ValueError:
-                    print("✗ Invalid number")
-        
-        # Ultrasonic Commands
-        elif device == "ultra":
-            if len(parts) < 2:
-                print("✗ Usage: ultra start/stop/read")
-            elif parts[1] == "start":
-                controller.ultrasonic_start()
-            elif parts[1] == "stop":
-                controller.ultrasonic_stop()
-            elif parts[1] == "read":
-                controller.ultrasonic_read()
-        
-        # Other Commands
-        elif device == "status":
-            controller.get_status()
-        elif device == "help":
-            await show_menu()
-        elif device in ["exit", "quit"]:
-            return False
+                print(f"✗ Usage: {_USAGE[device]}")
+                return True
+            handler = _CMD_TABLE.get((device, sub))
+            if handler is None:
+                await _dispatch_argument(controller, device, sub, line)
+                return True
         else:
-            print(f"✗ Unknown command: {device}")
-            print("  Type 'help' for available commands")
+            handler = _CMD_TABLE.get((device, ""))
+            if handler is None:
+                print(f"✗ Unknown command: {device}")
+                print("  Type 'help' for available commands")
+                return True
+        
+        result = handler(controller, parts)
+        if asyncio.iscoroutine(result):
+            await result
     
     except Exception as e:
         print(f"✗ Error processing command: {e}")
     
     return True
 
+def _read_stdin(buf, lines):
+    """stdin is readable: move whole lines from buf onto the lines queue (None at EOF)"""
+    data = os.read(sys.stdin.fileno(), 4096)
+    if not data:
+        asyncio.get_running_loop().remove_reader(sys.stdin.fileno())
+        if buf:
+            lines.put_nowait(buf.decode('utf-8', errors='replace'))  # Last line had no newline
+            buf.clear()
+        lines.put_nowait(None)
+        return
+    buf += data
+    while (end := buf.find(b"\n")) != -1:
+        lines.put_nowait(buf[:end].decode('utf-8', errors='replace'))
+        del buf[:end + 1]
+
+def open_console():
+    """Return an async input(prompt) - stdin watched by the event loop where it can be
+
+    Falls back to aioconsole on Windows (and anywhere stdin can't be polled).
+    """
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue()
+    try:
+        loop.add_reader(sys.stdin.fileno(), _read_stdin, bytearray(), lines)
+    except (NotImplementedError, OSError, ValueError):
+        import aioconsole
+        return aioconsole.ainput
+    
+    async def ainput(prompt=""):
+        print(prompt, end="", flush=True)
+        line = await lines.get()
+        if line is None:
+            raise EOFError
+        return line
+    return ainput
+
 async def main():
     """Main async function"""
     print("\n" + "="*65)
@@ -397,15 +733,16 @@ async def main():
     controller.running = True
     
     # Start response reader task
-    reader_task = asyncio.create_task(controller.read_responses())
+    controller.start_reading()
     
     await show_menu()
+    ainput = open_console()
     
     try:
         while controller.running:
             try:
                 # Non-blocking input
-                user_input = await aioconsole.ainput("\n> ")
+                user_input = await ainput("\n> ")
                 if not await process_command(controller, user_input):
                     break
             except EOFError:
@@ -413,14 +750,11 @@ async def main():
     except KeyboardInterrupt:
         print("\n\n✓ Interrupted by user")
     finally:
-        controller.close()
-        reader_task.cancel()
-        try:
-            await reader_task
-        except asyncio.CancelledError:
-            pass
+        await controller.close()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
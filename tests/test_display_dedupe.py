@@ -0,0 +1,125 @@
+"""Display dedupe in arduino_mcp_server, against a loopback stand-in for the Arduino"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastmcp")
+pytest.importorskip("serial")
+
+import arduino_mcp_server as server
+
+
+class LoopbackSerial:
+    """Acks every text command with OK:<command>, like the sketch
+
+    Commands in drop go unanswered; those in late are acked after the next write.
+    """
+
+    def __init__(self, port, baudrate, timeout=None):
+        self.port = port
+        self.timeout = timeout
+        self.is_open = True
+        self.written = []
+        self.drop = set()
+        self.late = set()
+        self._held = b""
+        self._rx = bytearray(b"READY\r\n")
+        self._cv = threading.Condition()
+
+    def write(self, data):
+        with self._cv:
+            held, self._held = self._held, b""
+            for line in bytes(data).splitlines():
+                command = line.decode()
+                self.written.append(command)
+                if command in self.late:
+                    self._held += b"OK:" + line + b"\r\n"
+                elif command not in self.drop:
+                    self._rx += b"OK:" + line + b"\r\n"
+                self._rx += held
+                held = b""
+            self._cv.notify_all()
+        return len(data)
+
+    def read_until(self, expected=b"\n"):
+        with self._cv:
+            self._cv.wait_for(lambda: expected in self._rx, self.timeout)
+            end = self._rx.find(expected)
+            end = len(self._rx) if end == -1 else end + len(expected)
+            line = bytes(self._rx[:end])
+            del self._rx[:end]
+            return line
+
+    def readline(self):
+        return self.read_until(b"\n")
+
+    def set_low_latency_mode(self, enable):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+@pytest.fixture
+def arduino(monkeypatch):
+    monkeypatch.setattr(server, "BINARY_PROTOCOL", False)
+    monkeypatch.setattr(server.serial, "Serial", LoopbackSerial)
+    monkeypatch.setattr(server, "_set_ftdi_latency_timer", lambda arduino: None)
+    server.reset_arduino()
+    server.start_background_monitor()
+    server.start_writer()
+    port = server.get_arduino()
+    yield port
+    server.reset_arduino()
+
+
+def _settled():
+    """Wait until the writer has handled everything queued so far"""
+    server.send_command_now("LED:ON")
+
+
+def test_repeat_is_skipped(arduino):
+    server.display_number(42)
+    _settled()
+    server.display_number(42)
+    _settled()
+    assert arduino.written.count("TM1637:NUM:42") == 1
+
+
+def test_same_batch_twice_redraws_after_clear(arduino):
+    server.welcome_message("John")
+    _settled()
+    server.welcome_message("John")
+    _settled()
+    assert arduino.written.count("LCD:LINE1:Welcome!") == 2
+    assert arduino.written.count("LCD:LINE2:John") == 2
+
+
+def test_lost_command_is_resent(arduino):
+    arduino.drop.add("LCD:LINE1:hello")
+    server.lcd_write_line1("hello")
+    _settled()
+    arduino.drop.clear()
+    server.lcd_write_line1("hello")
+    _settled()
+    assert arduino.written.count("LCD:LINE1:hello") == 2
+
+
+def test_late_ack_does_not_count_for_the_next_command(arduino):
+    arduino.late.add("LCD:LINE1:hello")
+    arduino.drop.add("LCD:LINE2:world")
+    server.lcd_write_line1("hello")
+    server.lcd_write_line2("world")  # Only the late LINE1 ack comes back
+    _settled()
+    arduino.drop.clear()
+    server.lcd_write_line2("world")
+    _settled()
+    assert arduino.written.count("LCD:LINE2:world") == 2
+
+
+def test_unacked_toggle_does_not_wait_for_the_timeout(arduino):
+    arduino.drop.add("LED:TOGGLE")
+    started = time.monotonic()
+    server.send_command_now("LED:TOGGLE")
+    assert time.monotonic() - started < server.REPLY_TIMEOUT / 2